@@ -32,6 +32,7 @@ class Config:
     FIREBASE_AUTH_DOMAIN: Optional[str] = os.getenv("FIREBASE_AUTH_DOMAIN")
     FIREBASE_DATABASE_URL: Optional[str] = os.getenv("FIREBASE_DATABASE_URL")
     FIREBASE_STORAGE_BUCKET: Optional[str] = os.getenv("FIREBASE_STORAGE_BUCKET")
+    SPEECH_AUDIO_BUCKET: Optional[str] = os.getenv("SPEECH_AUDIO_BUCKET")  # Staging bucket for long-running STT
     
     # Application Configuration
     APP_NAME: str = os.getenv("APP_NAME", "A4AI Backend")
@@ -53,6 +54,9 @@ class Config:
     DATABASE_URL: Optional[str] = os.getenv("DATABASE_URL")
     DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
     
+    # Redis Configuration (shared voice session state; in-process only when unset)
+    REDIS_URL: Optional[str] = os.getenv("REDIS_URL")
+    
     # File Upload Configuration
     MAX_FILE_SIZE: int = int(os.getenv("MAX_FILE_SIZE", "10485760"))  # 10MB
     ALLOWED_EXTENSIONS: list = os.getenv("ALLOWED_EXTENSIONS", "wav,mp3,flac,webm").split(",")
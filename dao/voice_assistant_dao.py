@@ -47,20 +47,25 @@ class VoiceAssistantDAO:
     # Collections
     VOICE_CONVERSATIONS_COLLECTION = "voice_conversations"
     VOICE_HISTORY_COLLECTION = "voice_history"
+    VOICE_SESSION_STATES_COLLECTION = "voice_session_states"
     
-    def save_conversation(self, user_id: str, conversation_data: Dict[str, Any]) -> Optional[str]:
+    # Firestore allows at most 500 writes per batch
+    MAX_BATCH_WRITES = 500
+    
+    def save_conversation(self, user_id: str, conversation_data: Dict[str, Any], conversation_id: Optional[str] = None) -> Optional[str]:
         """
         Save voice conversation to Firestore
         
         Args:
             user_id: User identifier
             conversation_data: Conversation data to save
+            conversation_id: Optional document ID to use instead of an auto-generated one
             
         Returns:
             str: Document ID if successful, None if failed
         """
         try:
-            conversation_ref = self.db.collection(self.VOICE_CONVERSATIONS_COLLECTION).document()
+            conversation_ref = self.db.collection(self.VOICE_CONVERSATIONS_COLLECTION).document(conversation_id)
             
             # Add metadata
             conversation_data.update({
@@ -247,6 +252,65 @@ class VoiceAssistantDAO:
                 "error": str(e),
                 "total_conversations": 0
             }
+    
+    def save_session_states_bulk(self, session_states: List[Dict[str, Any]]) -> bool:
+        """
+        Save many voice session states with batched writes
+        
+        Args:
+            session_states: Session state dicts, each stored under its "session_id"
+            
+        Returns:
+            bool: True if every batch was committed, False otherwise
+        """
+        try:
+            collection = self.db.collection(self.VOICE_SESSION_STATES_COLLECTION)
+            
+            for start in range(0, len(session_states), self.MAX_BATCH_WRITES):
+                batch = self.db.batch()
+                for session_state in session_states[start:start + self.MAX_BATCH_WRITES]:
+                    batch.set(collection.document(session_state["session_id"]), {
+                        **session_state,
+                        "updated_at": firestore.SERVER_TIMESTAMP
+                    })
+                batch.commit()
+            
+            logger.info(f"Saved {len(session_states)} voice session states")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to save {len(session_states)} voice session states: {str(e)}")
+            return False
+
+    def save_voice_sessions_bulk(self, sessions: List[Dict[str, Any]]) -> bool:
+        """
+        Save many voice session records with batched writes
+        
+        Args:
+            sessions: Session records, each stored under an auto-generated document ID
+            
+        Returns:
+            bool: True if every batch was committed, False otherwise
+        """
+        try:
+            collection = self.db.collection("voice_sessions")
+            
+            for start in range(0, len(sessions), self.MAX_BATCH_WRITES):
+                batch = self.db.batch()
+                for session_data in sessions[start:start + self.MAX_BATCH_WRITES]:
+                    batch.set(collection.document(), {
+                        **session_data,
+                        "created_at": firestore.SERVER_TIMESTAMP,
+                        "updated_at": firestore.SERVER_TIMESTAMP
+                    })
+                batch.commit()
+            
+            logger.info(f"Saved {len(sessions)} voice sessions")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to save {len(sessions)} voice sessions: {str(e)}")
+            return False
 
 # Create a singleton instance
 voice_assistant_dao = VoiceAssistantDAO()
@@ -1,11 +1,12 @@
 import logging
 import time
+import asyncio
 import os
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
@@ -49,6 +50,13 @@ async def lifespan(app: FastAPI):
     os.makedirs(temp_image_dir, exist_ok=True)
     logger.info(f"Created directories: {uploads_dir}, {temp_image_dir}")
     
+    # Synthesize canned voice responses in the background
+    try:
+        from services.voice_assistant_service import prewarm_tts_cache
+        app.state.tts_prewarm_task = asyncio.create_task(prewarm_tts_cache())
+    except Exception as e:
+        logger.warning(f"TTS cache pre-warm skipped: {e}")
+    
     logger.info("Application startup complete")
     
     yield
@@ -65,6 +73,7 @@ app = FastAPI(
     redoc_url="/redoc" if Config.DEBUG else None,
     openapi_url="/openapi.json" if Config.DEBUG else None,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Mount static files for serving uploaded images
@@ -385,8 +385,10 @@ async def get_audio_file(audio_filename: str):
         audio_dir = os.path.join(os.getcwd(), "temp_audio")
         audio_path = os.path.join(audio_dir, audio_filename)
         
-        # Check if file exists
-        if not os.path.exists(audio_path):
+        # Check if file exists; the stat is handed to FileResponse so it is not repeated
+        try:
+            stat_result = os.stat(audio_path)
+        except FileNotFoundError:
             logger.warning(f"Audio file not found: {audio_filename}")
             raise HTTPException(status_code=404, detail="Audio file not found")
         
@@ -395,6 +397,7 @@ async def get_audio_file(audio_filename: str):
             path=audio_path,
             media_type="audio/mpeg",
             filename=audio_filename,
+            stat_result=stat_result,
             headers={"Cache-Control": "public, max-age=3600"}  # Cache for 1 hour
         )
         
@@ -3,6 +3,7 @@ Unified Voice Controller - Combines all voice and text-based AI capabilities
 Handles both traditional voice processing and modern text-based interactions
 """
 
+import asyncio
 import logging
 import os
 import uuid
@@ -451,8 +452,7 @@ async def _generate_audio_response(text: str) -> Dict[str, Any]:
     """Generate audio from text response"""
     try:
         from google.cloud import texttospeech
-        
-        tts_client = texttospeech.TextToSpeechClient()
+        from services.voice_assistant_service import tts_client
         
         synthesis_input = texttospeech.SynthesisInput(text=text)
         voice_params = texttospeech.VoiceSelectionParams(
@@ -463,7 +463,8 @@ async def _generate_audio_response(text: str) -> Dict[str, Any]:
             audio_encoding=texttospeech.AudioEncoding.MP3
         )
         
-        response = tts_client.synthesize_speech(
+        response = await asyncio.to_thread(
+            tts_client.synthesize_speech,
             input=synthesis_input,
             voice=voice_params,
             audio_config=audio_config
@@ -4,6 +4,7 @@ Replaces: voice_unified.py, voice_sessions.py, voice_text_enhanced.py, voice_com
 All voice-related functionality in one precise, organized module
 """
 
+import asyncio
 import logging
 import os
 import uuid
@@ -11,11 +12,11 @@ import json
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File, Form
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
 from auth_middleware import firebase_auth
-from services.voice_assistant_service import process_voice_command
+from services.voice_assistant_service import process_voice_command, STREAMING_TTS_MEDIA_TYPE
 from services.voice_session_service import VoiceSessionService
 from services.vertex_ai import VertexAIService
 from dao.voice_assistant_dao import VoiceAssistantDAO
@@ -263,6 +264,35 @@ async def transcribe_audio(
             status_code=500
         )
 
+@router.post("/assistant-stream",
+             summary="Streaming Voice Assistant",
+             description="Stream the spoken reply to a voice command while it is being generated")
+async def streaming_voice_assistant(
+    audio_file: UploadFile = File(..., description="Audio file for voice processing"),
+    user_id: str = Form(..., description="User identifier"),
+    session_id: Optional[str] = Form(None, description="Session ID for conversation continuity"),
+    user_data: dict = Depends(firebase_auth)
+):
+    """Speech-to-text → streamed AI reply → streaming TTS, returned as one Ogg Opus stream"""
+    result = await voice_session_service.stream_session_voice_command(audio_file, user_id, session_id)
+    
+    if result["status"] == "error":
+        raise HTTPException(status_code=400, detail=result["error"])
+    
+    headers = {
+        "Cache-Control": "no-store",
+        "X-Session-Id": result["session_id"]
+    }
+    # No-speech replies are not stored, so they have no conversation id
+    if result["conversation_id"]:
+        headers["X-Conversation-Id"] = result["conversation_id"]
+    
+    return StreamingResponse(
+        result["audio_stream"],
+        media_type=STREAMING_TTS_MEDIA_TYPE,
+        headers=headers
+    )
+
 @router.post("/text-chat",
              summary="Text-Only Chat",
              description="Direct text conversation with AI")
@@ -388,13 +418,16 @@ async def download_audio(filename: str):
         audio_dir = os.path.join(os.getcwd(), "temp_audio")
         file_path = os.path.join(audio_dir, filename)
         
-        if not os.path.exists(file_path):
+        try:
+            stat_result = os.stat(file_path)
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail="Audio file not found")
         
         return FileResponse(
             file_path,
             media_type="audio/mpeg",
-            filename=filename
+            filename=filename,
+            stat_result=stat_result
         )
     except Exception as e:
         logger.error(f"Audio download error: {str(e)}")
@@ -496,8 +529,7 @@ async def _generate_audio_response(text: str) -> Dict[str, Any]:
     """Generate audio from text"""
     try:
         from google.cloud import texttospeech
-        
-        tts_client = texttospeech.TextToSpeechClient()
+        from services.voice_assistant_service import tts_client
         
         synthesis_input = texttospeech.SynthesisInput(text=text)
         voice = texttospeech.VoiceSelectionParams(
@@ -508,7 +540,8 @@ async def _generate_audio_response(text: str) -> Dict[str, Any]:
             audio_encoding=texttospeech.AudioEncoding.MP3
         )
         
-        response = tts_client.synthesize_speech(
+        response = await asyncio.to_thread(
+            tts_client.synthesize_speech,
             input=synthesis_input, voice=voice, audio_config=audio_config
         )
         
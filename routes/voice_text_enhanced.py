@@ -7,6 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List, Union
 from datetime import datetime
+import asyncio
 import logging
 import json
 
@@ -402,7 +403,8 @@ async def _generate_audio_response(text: str, voice_style: str = "default") -> D
             audio_encoding=texttospeech.AudioEncoding.MP3
         )
         
-        tts_response = tts_client.synthesize_speech(
+        tts_response = await asyncio.to_thread(
+            tts_client.synthesize_speech,
             input=synthesis_input,
             voice=voice_params,
             audio_config=audio_config
@@ -221,27 +221,27 @@ async def download_audio_file(
         # Construct file path
         audio_path = os.path.join(os.getcwd(), "temp_audio", filename)
         
-        # Verify file exists and is safe
-        if not os.path.exists(audio_path):
-            raise HTTPException(status_code=404, detail="Audio file not found")
-        
         # Security check: ensure filename doesn't contain path traversal
         if ".." in filename or "/" in filename or "\\" in filename:
             raise HTTPException(status_code=400, detail="Invalid filename")
         
+        # One stat covers existence, size and the FileResponse headers
+        try:
+            stat_result = os.stat(audio_path)
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="Audio file not found")
+        if stat_result.st_size == 0:
+            raise HTTPException(status_code=404, detail="Audio file is empty")
+        
         # Determine media type
         media_type = mimetypes.guess_type(audio_path)[0] or "audio/mpeg"
         
-        # Check file size to ensure it's valid
-        file_size = os.path.getsize(audio_path)
-        if file_size == 0:
-            raise HTTPException(status_code=404, detail="Audio file is empty")
-        
         # Return file with enhanced headers for browser compatibility
         return FileResponse(
             path=audio_path,
             media_type=media_type,
             filename=filename,
+            stat_result=stat_result,
             headers={
                 "Cache-Control": "public, max-age=3600",
                 "Content-Disposition": f"inline; filename={filename}",
@@ -278,19 +278,19 @@ async def serve_audio_file(filename: str):
         # Construct file path
         audio_path = os.path.join(os.getcwd(), "temp_audio", filename)
         
-        # Verify file exists
-        if not os.path.exists(audio_path):
+        # One stat covers existence, size and the FileResponse headers
+        try:
+            stat_result = os.stat(audio_path)
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail="Audio file not found")
-        
-        # Check file size to ensure it's valid
-        file_size = os.path.getsize(audio_path)
-        if file_size == 0:
+        if stat_result.st_size == 0:
             raise HTTPException(status_code=404, detail="Audio file is empty")
         
-        # Return file with headers optimized for browser audio playback
+        # Return file with headers optimized for browser audio playback; streamed via sendfile where supported
         return FileResponse(
             path=audio_path,
             media_type="audio/mpeg",
+            stat_result=stat_result,
             headers={
                 "Cache-Control": "public, max-age=3600",
                 "Content-Disposition": f"inline; filename={filename}",
@@ -298,8 +298,7 @@ async def serve_audio_file(filename: str):
                 "Content-Type": "audio/mpeg",
                 "Access-Control-Allow-Origin": "*",
                 "Access-Control-Allow-Methods": "GET, OPTIONS, HEAD",
-                "Access-Control-Allow-Headers": "Range, Content-Range",
-                "Content-Length": str(file_size)
+                "Access-Control-Allow-Headers": "Range, Content-Range"
             }
         )
         
@@ -4,6 +4,7 @@ Handles generation of interactive stories, AR/VR content, and badge management
 """
 import os
 import json
+import asyncio
 import logging
 from typing import Dict, Any, Optional, List
 from datetime import datetime
@@ -631,7 +632,8 @@ async def _generate_story_audio(story_text: str, language: str = "English") -> s
         print(f"🎙️ Generating audio for {language} ({language_code}) - {len(text_to_use)} chars")
         
         # Generate audio
-        tts_response = tts_client.synthesize_speech(
+        tts_response = await asyncio.to_thread(
+            tts_client.synthesize_speech,
             input=synthesis_input, 
             voice=voice_params, 
             audio_config=audio_config
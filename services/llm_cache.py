@@ -0,0 +1,173 @@
+"""
+LLM Response Cache
+Two-tier cache for Gemini generate_content calls: exact prompt matches and
+semantically similar questions
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Time-to-live for cached responses
+ANSWER_TTL_SECONDS = 60 * 60  # Free-form answers
+SUMMARY_TTL_SECONDS = 24 * 60 * 60  # Near-deterministic topic/summary prompts
+
+# Questions this short, or containing numbers, differ in ways embeddings blur
+# ("what is 7x8" vs "what is 7x9"), so they only use the exact tier
+SEMANTIC_MIN_WORDS = 4
+_DIGIT_RE = re.compile(r"\d")
+
+
+def _semantic_eligible(text: str) -> bool:
+    """Whether a question may be answered from a similar cached question"""
+    return len(text.split()) >= SEMANTIC_MIN_WORDS and not _DIGIT_RE.search(text)
+
+
+class LLMCache:
+    """Caches Gemini responses by exact prompt hash and by question similarity"""
+
+    def __init__(
+        self,
+        model,
+        model_name: str,
+        max_entries: int = 2048,
+        semantic_max_entries: int = 512,
+        similarity_threshold: float = 0.92,
+        embedding_model_name: str = "text-embedding-004"
+    ):
+        self.model = model
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.semantic_max_entries = semantic_max_entries
+        self.similarity_threshold = similarity_threshold
+        self.embedding_model_name = embedding_model_name
+
+        # Exact tier: blake2b(model_name + prompt) -> (expires_at, response_text)
+        self._entries: "OrderedDict[bytes, Tuple[float, str]]" = OrderedDict()
+
+        # Semantic tier: row i of _vectors is the normalized embedding of _texts[i]
+        self._embedding_model = None
+        self._vectors: Optional[np.ndarray] = None
+        self._texts: List[str] = []
+        self._expires_at: List[float] = []
+
+    def _key(self, prompt: str) -> bytes:
+        # Keys never leave the process; a 128-bit blake2b digest is cheaper than sha256 and ample here
+        return hashlib.blake2b(f"{self.model_name}\x00{prompt}".encode("utf-8"), digest_size=16).digest()
+
+    def get(self, prompt: str) -> Optional[str]:
+        """Return the cached response for an identical prompt, if still fresh"""
+        key = self._key(prompt)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, text = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return text
+
+    def set(self, prompt: str, text: str, ttl: float = ANSWER_TTL_SECONDS):
+        """Store a response for an exact prompt"""
+        key = self._key(prompt)
+        self._entries[key] = (time.monotonic() + ttl, text)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _embed(self, text: str) -> Optional[np.ndarray]:
+        """Embed text with Vertex AI; returns a unit vector or None on failure"""
+        try:
+            if self._embedding_model is None:
+                from vertexai.language_models import TextEmbeddingModel
+                self._embedding_model = TextEmbeddingModel.from_pretrained(self.embedding_model_name)
+            embeddings = await asyncio.to_thread(self._embedding_model.get_embeddings, [text])
+            vector = np.asarray(embeddings[0].values, dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            return vector / norm if norm else None
+        except Exception as e:
+            logger.warning(f"Embedding for semantic cache failed: {e}")
+            return None
+
+    def _semantic_lookup(self, vector: np.ndarray) -> Optional[str]:
+        if self._vectors is None or not self._texts:
+            return None
+        scores = self._vectors @ vector
+        now = time.monotonic()
+        for index in np.argsort(scores)[::-1]:
+            if scores[index] < self.similarity_threshold:
+                break
+            if self._expires_at[index] >= now:
+                return self._texts[index]
+        return None
+
+    def _semantic_store(self, vector: np.ndarray, text: str, ttl: float):
+        if self._vectors is None:
+            self._vectors = vector[np.newaxis, :]
+        else:
+            self._vectors = np.vstack([self._vectors, vector])
+        self._texts.append(text)
+        self._expires_at.append(time.monotonic() + ttl)
+
+        # Evict the oldest entries once the index is full
+        overflow = len(self._texts) - self.semantic_max_entries
+        if overflow > 0:
+            self._vectors = self._vectors[overflow:]
+            del self._texts[:overflow]
+            del self._expires_at[:overflow]
+
+    async def generate(
+        self,
+        prompt: str,
+        ttl: float = ANSWER_TTL_SECONDS,
+        semantic_key: Optional[str] = None
+    ) -> str:
+        """
+        Return the Gemini response text for a prompt, using the cache when possible
+
+        Args:
+            prompt: Full prompt sent to the model
+            ttl: Seconds the response stays cached
+            semantic_key: User-facing question to match semantically; only the
+                variable part of the prompt should be passed here, since the
+                surrounding template would make every prompt look alike. Short
+                questions and questions with digits skip the semantic tier
+
+        Returns:
+            str: Response text
+        """
+        cached = self.get(prompt)
+        if cached is not None:
+            logger.debug("LLM cache hit (exact)")
+            return cached
+
+        # The lookup must finish before Gemini is called: a running generate_content
+        # call cannot be cancelled, so overlapping them would pay for both on a hit
+        vector = None
+        if semantic_key and _semantic_eligible(semantic_key):
+            vector = await self._embed(semantic_key.strip())
+            if vector is not None:
+                cached = self._semantic_lookup(vector)
+                if cached is not None:
+                    logger.debug("LLM cache hit (semantic)")
+                    self.set(prompt, cached, ttl)
+                    return cached
+
+        response = await asyncio.to_thread(self.model.generate_content, prompt)
+        text = response.text
+
+        if text and text.strip():
+            self.set(prompt, text, ttl)
+            if vector is not None:
+                self._semantic_store(vector, text, ttl)
+
+        return text
@@ -0,0 +1,125 @@
+"""
+Redis Session Store
+Shares voice session state across workers so any worker can continue a
+conversation, and lets Redis expire idle sessions on its own
+"""
+
+import hashlib
+import json
+import logging
+import time
+from datetime import timezone
+from typing import Dict, Any, List, Optional
+
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+SESSION_KEY = "vsess:{session_id}"
+HISTORY_KEY = "vsess:{session_id}:history"
+USER_INDEX_KEY = "vsess:by_user:{user_id}"
+TOPIC_KEY = "vsess:topic:{digest}"
+
+
+class RedisSessionStore:
+    """
+    Session state in Redis
+
+    Each session is a hash at ``vsess:{session_id}``, its conversation history a
+    capped list at ``vsess:{session_id}:history`` (newest first), and each user
+    has a sorted set ``vsess:by_user:{user_id}`` of session ids scored by last
+    interaction time. Every key carries the session timeout as its TTL.
+
+    Conversation topics are also cached across sessions and workers at
+    ``vsess:topic:{digest}``, keyed by a hash of the normalized opening words.
+    """
+
+    def __init__(self, url: str, ttl_seconds: int = 1800, max_history: int = 10):
+        self._redis = redis.from_url(url, decode_responses=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_history = max_history
+
+    async def save(self, session) -> None:
+        """Write session fields and refresh expiry on all of its keys"""
+        key = SESSION_KEY.format(session_id=session.session_id)
+        history_key = HISTORY_KEY.format(session_id=session.session_id)
+        user_key = USER_INDEX_KEY.format(user_id=session.user_id)
+
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.hset(key, mapping={
+            "user_id": session.user_id,
+            "created_at": session.created_at.isoformat(),
+            "last_interaction_at": session.last_interaction_at.isoformat(),
+            "topic": session.topic,
+            "context_summary": session.context_summary,
+            "total_interactions": session.total_interactions
+        })
+        pipe.expire(key, self.ttl_seconds)
+        pipe.expire(history_key, self.ttl_seconds)
+        # Session datetimes are naive UTC
+        score = session.last_interaction_at.replace(tzinfo=timezone.utc).timestamp()
+        pipe.zadd(user_key, {session.session_id: score})
+        pipe.expire(user_key, self.ttl_seconds)
+        await pipe.execute()
+
+    async def append_history(self, session_id: str, interaction: Dict[str, Any]) -> None:
+        """Push an interaction onto the capped history list"""
+        history_key = HISTORY_KEY.format(session_id=session_id)
+
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.lpush(history_key, json.dumps(interaction))
+        pipe.ltrim(history_key, 0, self.max_history - 1)
+        pipe.expire(history_key, self.ttl_seconds)
+        await pipe.execute()
+
+    async def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a session's stored fields
+
+        Returns:
+            Dict with the hash fields plus "conversation_history" (oldest first),
+            or None if the session does not exist or has expired
+        """
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.hgetall(SESSION_KEY.format(session_id=session_id))
+        pipe.lrange(HISTORY_KEY.format(session_id=session_id), 0, -1)
+        fields, history = await pipe.execute()
+
+        if not fields:
+            return None
+
+        fields["session_id"] = session_id
+        fields["total_interactions"] = int(fields.get("total_interactions", 0))
+        fields["conversation_history"] = [json.loads(item) for item in reversed(history)]
+        return fields
+
+    async def delete(self, session_id: str, user_id: str) -> None:
+        """Remove a session and its index entry"""
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.delete(SESSION_KEY.format(session_id=session_id), HISTORY_KEY.format(session_id=session_id))
+        pipe.zrem(USER_INDEX_KEY.format(user_id=user_id), session_id)
+        await pipe.execute()
+
+    @staticmethod
+    def _topic_key(text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+        return TOPIC_KEY.format(digest=digest)
+
+    async def get_topic(self, text: str) -> Optional[str]:
+        """Topic previously identified for this normalized text, if any"""
+        return await self._redis.get(self._topic_key(text))
+
+    async def set_topic(self, text: str, topic: str, ttl_seconds: int) -> None:
+        """Share an identified topic with every worker"""
+        await self._redis.set(self._topic_key(text), topic, ex=ttl_seconds)
+
+    async def user_session_ids(self, user_id: str) -> List[str]:
+        """Ids of a user's sessions that are still within the timeout"""
+        user_key = USER_INDEX_KEY.format(user_id=user_id)
+        cutoff = time.time() - self.ttl_seconds
+
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.zremrangebyscore(user_key, "-inf", cutoff)
+        pipe.zrange(user_key, 0, -1)
+        _, session_ids = await pipe.execute()
+        return session_ids
@@ -0,0 +1,123 @@
+"""
+TTS Audio Cache
+Stores synthesized speech on disk keyed by (text, voice, encoding) so repeated
+responses skip the Text-to-Speech API entirely
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Disk budget for cached audio; least recently used files are pruned beyond it
+TTS_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# Pruning goes below the budget so it does not rerun on every store
+TTS_CACHE_PRUNE_RATIO = 0.8
+
+
+class TTSCache:
+    """
+    Disk-backed cache of synthesized audio, one file per (text, voice, encoding)
+
+    Size is bounded by max_bytes. A file's mtime marks its last use, and once
+    the running total passes the budget the least recently used files are
+    removed. Response files are hard links, so pruning never breaks a download.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = TTS_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._lock = threading.Lock()  # Stores run in worker threads
+        self._size = sum(entry.stat().st_size for entry in self._entries())
+
+    def _entries(self):
+        return [entry for entry in os.scandir(self.cache_dir) if entry.is_file() and entry.name.endswith(".mp3")]
+
+    def _path(self, text: str, voice_name: str, encoding: str) -> str:
+        digest = hashlib.sha256(f"{text}\x00{voice_name}\x00{encoding}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.mp3")
+
+    def contains(self, text: str, voice_name: str, encoding: str = "MP3") -> bool:
+        """Check whether audio for this text and voice is already cached"""
+        return os.path.exists(self._path(text, voice_name, encoding))
+
+    def copy_to(self, text: str, voice_name: str, encoding: str, dest_path: str) -> bool:
+        """
+        Materialize cached audio at dest_path
+
+        Uses a hard link where possible so no audio bytes are copied; falls back
+        to a file copy when linking is not supported.
+
+        Returns:
+            bool: True on cache hit, False if nothing was cached
+        """
+        cached_path = self._path(text, voice_name, encoding)
+        try:
+            os.link(cached_path, dest_path)
+        except FileNotFoundError:
+            return False
+        except OSError:
+            try:
+                shutil.copyfile(cached_path, dest_path)
+            except OSError as e:
+                logger.warning(f"TTS cache copy failed: {e}")
+                return False
+        self._mark_used(cached_path)
+        return True
+
+    @staticmethod
+    def _mark_used(cached_path: str):
+        try:
+            os.utime(cached_path)
+        except OSError:
+            pass  # Pruned concurrently; the linked copy is already in place
+
+    def store(self, text: str, voice_name: str, encoding: str, audio_content: bytes):
+        """Persist synthesized audio; written atomically so readers never see partial files"""
+        if not audio_content:
+            return
+        cached_path = self._path(text, voice_name, encoding)
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as out:
+                out.write(audio_content)
+            os.replace(tmp_path, cached_path)
+        except OSError as e:
+            logger.warning(f"TTS cache store failed: {e}")
+            return
+
+        with self._lock:
+            self._size += len(audio_content)
+            if self._size > self.max_bytes:
+                self._prune()
+
+    def _prune(self):
+        """Remove least recently used files until the cache is well under its budget"""
+        try:
+            entries = [(entry.stat(), entry.path) for entry in self._entries()]
+        except OSError as e:
+            logger.warning(f"TTS cache prune failed: {e}")
+            return
+
+        # Recount from disk: other workers share the directory
+        self._size = sum(stat.st_size for stat, _ in entries)
+        target = self.max_bytes * TTS_CACHE_PRUNE_RATIO
+        removed = 0
+        for stat, path in sorted(entries, key=lambda item: item[0].st_mtime):
+            if self._size <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # Already pruned by another worker
+            except OSError as e:
+                logger.warning(f"TTS cache could not remove {path}: {e}")
+                continue
+            self._size -= stat.st_size
+            removed += 1
+        logger.info(f"Pruned {removed} cached TTS files")
@@ -3,6 +3,7 @@ Visual Aid Service
 Handles generation of educational visual content using Vertex AI Gemini
 """
 import logging
+import functools
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 import uuid
@@ -16,6 +17,15 @@ logger = logging.getLogger(__name__)
 # Initialize image generator
 image_generator = ImageGenerator()
 
+# Style requirements appended to every educational prompt
+_STATIC_STYLE = ", ".join([
+    "Educational illustration style",
+    "Clear, informative, and engaging",
+    "Suitable for classroom use",
+    "Professional educational quality"
+])
+_NO_CTX_SUFFIX = "\n\nStyle requirements: " + _STATIC_STYLE
+
 
 @handle_service_dao_errors("generate_visual_aid")
 async def generate_visual_aid(
@@ -247,17 +257,13 @@ async def get_user_visual_aids(
     
     visual_aids = visual_aid_dao.get_user_visual_aids(user_id, limit, asset_type)
     
-    # Enhance with additional metadata
-    enhanced_visual_aids = []
+    # Enhance with additional metadata (DAO returns fresh dicts, so update in place)
     for visual_aid in visual_aids:
-        enhanced_visual_aid = {
-            **visual_aid,
-            "display_topic": _format_topic_for_display(visual_aid.get("topic", "")),
-            "created_date": visual_aid.get("created_at", "").split("T")[0] if visual_aid.get("created_at") else None
-        }
-        enhanced_visual_aids.append(enhanced_visual_aid)
+        created_at = visual_aid.get("created_at")
+        visual_aid["display_topic"] = _format_topic_for_display(visual_aid.get("topic", ""))
+        visual_aid["created_date"] = created_at.split("T")[0] if created_at else None
     
-    return enhanced_visual_aids
+    return visual_aids
 
 
 @handle_service_dao_errors("search_visual_aids")
@@ -384,12 +390,17 @@ async def _create_fallback_visual_aid(
     }
 
 
+@functools.lru_cache(maxsize=512)
 def _enhance_prompt_for_education(
     prompt: str, 
     grade_level: Optional[int], 
     subject: Optional[str]
 ) -> str:
     """Enhance prompt with educational context"""
+    # Fast path: most callers provide neither grade nor subject
+    if not grade_level and not subject:
+        return prompt + _NO_CTX_SUFFIX
+    
     enhancements = []
     
     if grade_level:
@@ -400,15 +411,7 @@ def _enhance_prompt_for_education(
     if subject:
         enhancements.append(f"Focused on {subject} education")
     
-    enhancements.extend([
-        "Educational illustration style",
-        "Clear, informative, and engaging",
-        "Suitable for classroom use",
-        "Professional educational quality"
-    ])
-    
-    enhanced_prompt = f"{prompt}\n\nStyle requirements: {', '.join(enhancements)}"
-    return enhanced_prompt
+    return f"{prompt}\n\nStyle requirements: {', '.join(enhancements)}, {_STATIC_STYLE}"
 
 
 def _extract_topic_from_prompt(prompt: str) -> str:
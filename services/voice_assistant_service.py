@@ -1,12 +1,20 @@
 import os
 import sys
-import tempfile
+import asyncio
+import queue
 import uuid
 import json
+import logging
+import re
 import time
-from datetime import datetime
+import hashlib
+import itertools
+import orjson
 from google.cloud import speech
 from google.cloud import texttospeech
+from google.cloud import storage
+from google.cloud.speech_v1.services.speech.transports import SpeechGrpcTransport
+from google.cloud.texttospeech_v1.services.text_to_speech.transports import TextToSpeechGrpcTransport
 import vertexai
 from vertexai.generative_models import GenerativeModel
 from google.api_core import retry, exceptions
@@ -14,6 +22,10 @@ from google.api_core import retry, exceptions
 # Add parent directory to path to import config.py from root
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import Config
+from services.llm_cache import LLMCache
+from services.tts_cache import TTSCache
+
+logger = logging.getLogger(__name__)
 
 # Set Google credentials
 os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = Config.GOOGLE_APPLICATION_CREDENTIALS
@@ -25,10 +37,49 @@ vertexai.init(project=Config.PROJECT_ID, location=Config.LOCATION)
 AUDIO_FILES_DIR = os.path.join(os.getcwd(), "temp_audio")
 os.makedirs(AUDIO_FILES_DIR, exist_ok=True)
 
+# Synthesized audio cache, keyed by response text and voice
+TTS_VOICE_NAME = "en-US-Standard-D"  # Standard voice (more reliable than Wavenet)
+tts_cache = TTSCache(os.path.join(AUDIO_FILES_DIR, "_cache"))
+
+# Streaming synthesis only emits raw or Ogg audio, not MP3
+STREAMING_TTS_ENCODING = texttospeech.AudioEncoding.OGG_OPUS
+STREAMING_TTS_MEDIA_TYPE = "audio/ogg"
+STREAMING_TTS_TIMEOUT_SECONDS = 60.0  # Covers the whole reply, which streams in while Gemini is still answering
+
+# Transcript reported when STT finds no speech, and the reply given for it
+NO_SPEECH_TRANSCRIPT = "No speech detected."
+NO_SPEECH_RESPONSE = "I didn't catch that. Please try again."
+
+# Canned responses whose audio is synthesized once at startup
+CANNED_RESPONSES = [
+    NO_SPEECH_RESPONSE,
+    "I couldn't understand the command. Please try again.",
+    "I'm ready to assist you with educational tasks. How can I help?",
+    "I'm here to help with your educational needs. Please try asking your question again."
+]
+
+# Keep each client's HTTP/2 connection alive between requests so concurrent
+# calls multiplex over it instead of reconnecting after idle periods
+GRPC_CHANNEL_OPTIONS = [
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.max_send_message_length", -1),
+    ("grpc.max_receive_message_length", -1),
+]
+
+
+def _keepalive_transport(transport_cls):
+    """Build a gRPC transport for a Google client over a keep-alive channel"""
+    host = f"{transport_cls.DEFAULT_HOST}:443"
+    channel = transport_cls.create_channel(host, options=GRPC_CHANNEL_OPTIONS)
+    return transport_cls(host=host, channel=channel)
+
+
 # Initialize clients once with timeout configuration
-speech_client = speech.SpeechClient()
-tts_client = texttospeech.TextToSpeechClient()
+speech_client = speech.SpeechClient(transport=_keepalive_transport(SpeechGrpcTransport))
+tts_client = texttospeech.TextToSpeechClient(transport=_keepalive_transport(TextToSpeechGrpcTransport))
 model = GenerativeModel(Config.GOOGLE_GEMINI_MODEL)
+llm_cache = LLMCache(model, Config.GOOGLE_GEMINI_MODEL)
 
 # Configure retry strategy for Google Cloud APIs
 retry_config = retry.Retry(
@@ -45,6 +96,34 @@ retry_config = retry.Retry(
     )
 )
 
+# Per-process secret and counter for audio filenames; the download routes serve
+# files by name, so names must stay unguessable without a per-call RNG read
+_FILENAME_KEY = os.urandom(16)
+_filename_counter = itertools.count()
+
+
+def audio_filename(prefix: str) -> str:
+    """Unique, unguessable MP3 filename for generated audio"""
+    token = hashlib.blake2b(next(_filename_counter).to_bytes(8, "little"), key=_FILENAME_KEY, digest_size=8).hexdigest()
+    return f"{prefix}_{time.time_ns()}_{token}.mp3"
+
+
+# Sentence boundary used to cut streamed Gemini text into TTS-sized pieces
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+# Markdown code fences Gemini sometimes wraps around JSON replies
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$", re.MULTILINE)
+
+
+def parse_json_response(text: str):
+    """
+    Parse a JSON reply from Gemini, ignoring surrounding code fences
+    
+    Raises:
+        json.JSONDecodeError: If the reply is not valid JSON
+    """
+    return orjson.loads(_FENCE_RE.sub("", text).strip())
+
 # Detect encoding based on extension
 def get_audio_encoding(file_extension):
     ext = file_extension.lower()
@@ -86,7 +165,7 @@ def generate_tts_audio_with_retry(text: str, max_retries: int = 3) -> bytes:
     """
     for attempt in range(max_retries):
         try:
-            print(f"🎙️ TTS Attempt {attempt + 1}/{max_retries}")
+            logger.debug("TTS attempt %d/%d", attempt + 1, max_retries)
             
             # Create synthesis input
             synthesis_input = texttospeech.SynthesisInput(text=text)
@@ -94,7 +173,7 @@ def generate_tts_audio_with_retry(text: str, max_retries: int = 3) -> bytes:
             # Use reliable voice configuration
             voice_params = texttospeech.VoiceSelectionParams(
                 language_code="en-US",
-                name="en-US-Standard-D",  # Use Standard voice (more reliable than Wavenet)
+                name=TTS_VOICE_NAME,
                 ssml_gender=texttospeech.SsmlVoiceGender.NEUTRAL
             )
             
@@ -106,7 +185,6 @@ def generate_tts_audio_with_retry(text: str, max_retries: int = 3) -> bytes:
             )
 
             # Make TTS request with retry and timeout
-            print(f"🔄 Making TTS request...")
             start_time = time.time()
             
             tts_response = tts_client.synthesize_speech(
@@ -120,36 +198,110 @@ def generate_tts_audio_with_retry(text: str, max_retries: int = 3) -> bytes:
             )
             
             elapsed_time = time.time() - start_time
-            print(f"✅ TTS request completed in {elapsed_time:.2f} seconds")
+            logger.debug("TTS request completed in %.2f seconds", elapsed_time)
             
             # Validate response
             if not tts_response.audio_content:
                 raise Exception("TTS service returned empty audio content")
             
-            print(f"✅ TTS audio generated successfully: {len(tts_response.audio_content)} bytes")
+            logger.debug("TTS audio generated: %d bytes", len(tts_response.audio_content))
             return tts_response.audio_content
             
         except (exceptions.DeadlineExceeded, exceptions.ServiceUnavailable, ConnectionError, TimeoutError) as e:
-            print(f"❌ TTS Attempt {attempt + 1} failed with network error: {e}")
+            logger.warning("TTS attempt %d failed with network error: %s", attempt + 1, e)
             if attempt < max_retries - 1:
                 wait_time = (attempt + 1) * 2  # Exponential backoff
-                print(f"⏳ Waiting {wait_time} seconds before retry...")
+                logger.debug("Waiting %d seconds before TTS retry", wait_time)
                 time.sleep(wait_time)
             else:
-                print(f"💀 All TTS attempts failed")
+                logger.error("All %d TTS attempts failed", max_retries)
                 raise Exception(f"TTS service unavailable after {max_retries} attempts: {e}")
                 
         except Exception as e:
-            print(f"❌ TTS Attempt {attempt + 1} failed with error: {e}")
+            logger.warning("TTS attempt %d failed with error: %s", attempt + 1, e)
             if attempt < max_retries - 1:
                 wait_time = (attempt + 1) * 2
-                print(f"⏳ Waiting {wait_time} seconds before retry...")
+                logger.debug("Waiting %d seconds before TTS retry", wait_time)
                 time.sleep(wait_time)
             else:
-                print(f"💀 All TTS attempts failed")
+                logger.error("All %d TTS attempts failed", max_retries)
                 raise Exception(f"TTS failed after {max_retries} attempts: {e}")
 
 
+async def stream_tts_audio(texts, voice: texttospeech.VoiceSelectionParams):
+    """
+    Synthesize text pieces over a single streaming TTS call, yielding audio as it arrives
+    
+    Pieces are forwarded to the TTS stream as soon as the caller produces them,
+    so synthesis of early sentences overlaps generation of later ones. The
+    blocking gRPC stream runs in a worker thread, as in stream_llm_sentences.
+    
+    Args:
+        texts: Async iterator of text pieces (e.g. sentences) in speaking order
+        voice: Voice to synthesize with; streaming synthesis needs a Journey or Chirp 3 HD voice
+        
+    Yields:
+        bytes: STREAMING_TTS_ENCODING audio chunks in playback order
+    """
+    loop = asyncio.get_running_loop()
+    pieces: queue.Queue = queue.Queue()
+    chunks: asyncio.Queue = asyncio.Queue()
+    done = object()
+    
+    def request_generator():
+        # The first request carries the voice/audio configuration, the rest carry text
+        yield texttospeech.StreamingSynthesizeRequest(
+            streaming_config=texttospeech.StreamingSynthesizeConfig(
+                voice=voice,
+                streaming_audio_config=texttospeech.StreamingAudioConfig(
+                    audio_encoding=STREAMING_TTS_ENCODING
+                )
+            )
+        )
+        while True:
+            text = pieces.get()
+            if text is done:
+                return
+            yield texttospeech.StreamingSynthesizeRequest(
+                input=texttospeech.StreamingSynthesisInput(text=text)
+            )
+    
+    def consume():
+        try:
+            for response in tts_client.streaming_synthesize(requests=request_generator(), timeout=STREAMING_TTS_TIMEOUT_SECONDS):
+                if response.audio_content:
+                    loop.call_soon_threadsafe(chunks.put_nowait, response.audio_content)
+        except Exception as e:
+            loop.call_soon_threadsafe(chunks.put_nowait, e)
+        finally:
+            loop.call_soon_threadsafe(chunks.put_nowait, done)
+    
+    async def feed():
+        try:
+            async for text in texts:
+                pieces.put(text)
+        finally:
+            # Always close the request stream so the gRPC call can finish
+            pieces.put(done)
+    
+    feeder = asyncio.ensure_future(feed())
+    consumer = asyncio.ensure_future(asyncio.to_thread(consume))
+    try:
+        while True:
+            item = await chunks.get()
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+        # Surface a failure of the text source (e.g. Gemini) once the audio has drained
+        await feeder
+    finally:
+        feeder.cancel()
+        pieces.put(done)  # In case the feeder was cancelled before it started
+        await consumer
+
+
 def create_fallback_audio(text: str) -> bytes:
     """
     Create a simple fallback audio when TTS fails completely
@@ -160,7 +312,7 @@ def create_fallback_audio(text: str) -> bytes:
     Returns:
         bytes: Simple MP3 audio file content
     """
-    print(f"🔇 Creating fallback audio for: {text[:50]}...")
+    logger.debug("Creating fallback audio for: %.50s", text)
     
     # Create a minimal MP3 file with silence
     # This is a very basic MP3 file header that represents a short silence
@@ -175,24 +327,229 @@ def create_fallback_audio(text: str) -> bytes:
     # Repeat the pattern to create a 1-second silence (approximate)
     fallback_audio = mp3_header * 100  # Creates ~1.6KB of audio data
     
-    print(f"🔇 Fallback audio created: {len(fallback_audio)} bytes")
+    logger.debug("Fallback audio created: %d bytes", len(fallback_audio))
     return fallback_audio
 
 
+async def prewarm_tts_cache():
+    """Synthesize canned responses ahead of time so they never hit TTS on the request path"""
+    for text in CANNED_RESPONSES:
+        if await asyncio.to_thread(tts_cache.contains, text, TTS_VOICE_NAME, "MP3"):
+            continue
+        try:
+            audio_content = await asyncio.to_thread(generate_tts_audio_with_retry, text, max_retries=1)
+            await asyncio.to_thread(tts_cache.store, text, TTS_VOICE_NAME, "MP3", audio_content)
+        except Exception as e:
+            logger.warning("Could not pre-warm TTS cache: %s", e)
+
+
+# Encodings whose container header carries the sample rate, so STT can read it itself
+_SELF_DESCRIBING_ENCODINGS = (
+    speech.RecognitionConfig.AudioEncoding.LINEAR16,
+    speech.RecognitionConfig.AudioEncoding.FLAC,
+    speech.RecognitionConfig.AudioEncoding.ENCODING_UNSPECIFIED
+)
+
+# One retry for transient Speech-to-Text errors
+STT_MAX_ATTEMPTS = 2
+
+# Larger uploads are staged in Cloud Storage and use long-running recognition
+STT_INLINE_MAX_BYTES = 1024 * 1024
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+MIN_UPLOAD_BYTES = 1000  # Anything smaller is probably not valid audio
+
+_storage_client = None
+
+
+def _stage_audio_in_gcs(content: bytes):
+    """Upload audio to the Speech bucket for long-running recognition; returns the blob"""
+    global _storage_client
+    if _storage_client is None:
+        _storage_client = storage.Client(project=Config.PROJECT_ID)
+    
+    blob = _storage_client.bucket(Config.SPEECH_AUDIO_BUCKET).blob(f"stt_uploads/{uuid.uuid4().hex}")
+    blob.upload_from_string(content)
+    return blob
+
+
+def _long_running_recognize(config, audio):
+    """Transcribe staged audio with long-running recognition"""
+    operation = speech_client.long_running_recognize(config=config, audio=audio)
+    return operation.result(timeout=120)
+
+
+def _delete_staged_audio(blob):
+    try:
+        blob.delete()
+    except Exception as e:
+        logger.warning("Could not delete staged STT audio %s: %s", blob.name, e)
+
+
+async def transcribe_audio_content(content: bytes, file_extension: str) -> str:
+    """
+    Convert uploaded audio bytes to text with Google Speech-to-Text
+    
+    Args:
+        content: Raw audio bytes
+        file_extension: Extension of the uploaded file, used to pick the encoding
+        
+    Returns:
+        str: Combined transcript, or "No speech detected." when nothing was recognized
+    """
+    # Get appropriate encoding and sample rate based on file extension
+    audio_encoding = get_audio_encoding(file_extension)
+    sample_rate = get_sample_rate_for_encoding(file_extension)
+    logger.debug("Detected audio encoding: %s, sample rate: %s", audio_encoding, sample_rate)
+
+    config_kwargs = {}
+    if audio_encoding not in _SELF_DESCRIBING_ENCODINGS:
+        # Formats without a header need the encoding spelled out
+        config_kwargs = {"encoding": audio_encoding, "sample_rate_hertz": sample_rate or 16000}
+
+    # Large clips go through Cloud Storage, which has no inline size or duration limit
+    use_gcs = len(content) > STT_INLINE_MAX_BYTES and bool(Config.SPEECH_AUDIO_BUCKET)
+
+    # Single recognition call; latest_short is tuned for short spoken commands
+    config = speech.RecognitionConfig(
+        language_code="en-US",
+        enable_automatic_punctuation=True,
+        model="latest_long" if use_gcs else "latest_short",
+        use_enhanced=True,
+        **config_kwargs
+    )
+
+    # Staged once; retries reuse the same object, which is deleted after the last attempt
+    staged_blob = None
+    if use_gcs:
+        staged_blob = await asyncio.to_thread(_stage_audio_in_gcs, content)
+        audio = speech.RecognitionAudio(uri=f"gs://{Config.SPEECH_AUDIO_BUCKET}/{staged_blob.name}")
+    else:
+        audio = speech.RecognitionAudio(content=content)
+
+    try:
+        for attempt in range(STT_MAX_ATTEMPTS):
+            try:
+                if use_gcs:
+                    stt_response = await asyncio.to_thread(_long_running_recognize, config, audio)
+                else:
+                    stt_response = await asyncio.to_thread(speech_client.recognize, config=config, audio=audio, timeout=30.0)
+                break
+            except (exceptions.ServiceUnavailable, exceptions.DeadlineExceeded) as e:
+                # Only transient transport errors are worth retrying; bad audio fails the same way twice
+                if attempt == STT_MAX_ATTEMPTS - 1:
+                    raise
+                wait_time = 0.5 * 2 ** attempt
+                logger.warning("Speech recognition attempt %d failed: %s; retrying in %.1fs", attempt + 1, e, wait_time)
+                await asyncio.sleep(wait_time)
+    finally:
+        if staged_blob is not None:
+            await asyncio.to_thread(_delete_staged_audio, staged_blob)
+
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug("Speech recognition results count: %d", len(stt_response.results) if stt_response.results else 0)
+
+    transcript = ""
+    if stt_response.results and len(stt_response.results) > 0:
+        # Combine all speech segments found
+        transcript_parts = []
+        for i, result in enumerate(stt_response.results):
+            if result.alternatives and len(result.alternatives) > 0:
+                segment_text = result.alternatives[0].transcript
+                if segment_text and segment_text.strip():
+                    transcript_parts.append(segment_text.strip())
+                elif debug:
+                    logger.debug("Segment %d is empty or whitespace only", i)
+            elif debug:
+                logger.debug("Result %d has no alternatives", i)
+
+        transcript = " ".join(transcript_parts)
+        if debug:
+            logger.debug("Final combined transcript: %r (parts: %d)", transcript, len(transcript_parts))
+    else:
+        logger.debug("No speech results found")
+
+    if not transcript.strip():
+        transcript = NO_SPEECH_TRANSCRIPT
+
+    return transcript
+
+
+async def stream_llm_sentences(prompt: str):
+    """
+    Stream a Gemini response sentence by sentence
+    
+    The blocking streaming call runs in a worker thread and hands complete
+    sentences to the event loop through an asyncio.Queue, so callers can start
+    synthesizing speech before the model has finished answering.
+    
+    Args:
+        prompt: Prompt to send to Gemini
+        
+    Yields:
+        str: Complete sentences in order
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+    
+    def produce():
+        buffer = ""
+        try:
+            for chunk in model.generate_content(prompt, stream=True):
+                buffer += chunk.text
+                *sentences, buffer = _SENTENCE_END_RE.split(buffer)
+                for sentence in sentences:
+                    loop.call_soon_threadsafe(queue.put_nowait, sentence)
+            loop.call_soon_threadsafe(queue.put_nowait, buffer)
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, done)
+    
+    producer = asyncio.ensure_future(asyncio.to_thread(produce))
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                raise item
+            if item.strip():
+                yield item.strip()
+    finally:
+        await producer
+
+
+async def read_audio_upload(audio_file):
+    """
+    Read an uploaded audio file, refusing oversized uploads
+    
+    The declared size is checked before reading, so an oversized body is never
+    buffered into memory when the client reports its size.
+    
+    Returns:
+        bytes: File content, or None if it exceeds MAX_UPLOAD_BYTES
+    """
+    upload_size = getattr(audio_file, "size", None)
+    if upload_size is not None and upload_size > MAX_UPLOAD_BYTES:
+        return None
+    content = await audio_file.read()
+    return content if len(content) <= MAX_UPLOAD_BYTES else None
+
+
 async def process_voice_command(audio_file) -> dict:
     """
     Upgraded: Speech-to-Text -> Intent Understanding -> Text-to-Speech
     Returns clean short AI response without reasoning.
     """
-    audio_path = None
-
     try:
-        # Save uploaded audio with original filename extension
+        # Read uploaded audio with original filename extension
         file_extension = audio_file.filename.split('.')[-1].lower() if audio_file.filename else 'wav'
-        content = await audio_file.read()
         
         # Validate file size (max 10MB)
-        if len(content) > 10 * 1024 * 1024:
+        content = await read_audio_upload(audio_file)
+        if content is None:
             return {
                 "status": "error",
                 "transcript": "File too large",
@@ -202,7 +559,7 @@ async def process_voice_command(audio_file) -> dict:
             }
         
         # Validate file has content
-        if len(content) < 1000:  # Less than 1KB is probably not valid audio
+        if len(content) < MIN_UPLOAD_BYTES:
             return {
                 "status": "error", 
                 "transcript": "File too small",
@@ -211,127 +568,61 @@ async def process_voice_command(audio_file) -> dict:
                 "error": "File size too small"
             }
         
-        print(f"Processing audio file: {audio_file.filename}, Size: {len(content)} bytes, Extension: {file_extension}")
+        logger.debug("Processing audio file: %s, size: %d bytes, extension: %s", audio_file.filename, len(content), file_extension)
         
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_extension}") as temp_audio:
-            temp_audio.write(content)
-            audio_path = temp_audio.name
-
         # --- STEP 1: Convert Speech to Text ---
-        with open(audio_path, "rb") as f:
-            audio_data = f.read()
+        transcript = await transcribe_audio_content(content, file_extension)
 
-        audio = speech.RecognitionAudio(content=audio_data)
-        
-        # Get appropriate encoding and sample rate based on file extension
-        audio_encoding = get_audio_encoding(file_extension)
-        sample_rate = get_sample_rate_for_encoding(file_extension)
-        print(f"Detected audio encoding: {audio_encoding}, Sample rate: {sample_rate}")
-        
-        # Try AUTO-DETECTION FIRST (most reliable)
-        config = speech.RecognitionConfig(
-            language_code="en-US",
-            enable_automatic_punctuation=True
-        )
-
-        try:
-            print("Attempting speech recognition with auto-detection...")
-            stt_response = speech_client.recognize(config=config, audio=audio)
-        except Exception as e:
-            print(f"Auto-detection failed: {e}")
-            # Fallback: Try with detected encoding
-            config = speech.RecognitionConfig(
-                language_code="en-US",
-                enable_automatic_punctuation=True,
-                encoding=get_audio_encoding(file_extension),
-                sample_rate_hertz=16000
-            )
-            try:
-                print("Attempting speech recognition with detected format...")
-                stt_response = speech_client.recognize(config=config, audio=audio)
-            except Exception as e2:
-                print(f"Detected format failed: {e2}")
-                # Last fallback: Most basic configuration
-                config = speech.RecognitionConfig(
-                    language_code="en-US"
-                )
-                print("Attempting speech recognition with basic config...")
-                stt_response = speech_client.recognize(config=config, audio=audio)
-        
-        # Debug: Check if we got any results
-        print(f"Speech recognition results count: {len(stt_response.results) if stt_response.results else 0}")
-        
-        transcript = ""
-        if stt_response.results and len(stt_response.results) > 0:
-            # Combine all speech segments found
-            transcript_parts = []
-            for i, result in enumerate(stt_response.results):
-                print(f"Processing result {i}: alternatives count = {len(result.alternatives) if result.alternatives else 0}")
-                if result.alternatives and len(result.alternatives) > 0:
-                    segment_text = result.alternatives[0].transcript
-                    print(f"Raw segment text {i}: '{segment_text}' (length: {len(segment_text)})")
-                    if segment_text and segment_text.strip():
-                        transcript_parts.append(segment_text.strip())
-                        print(f"Added speech segment {i}: '{segment_text.strip()}'")
-                    else:
-                        print(f"Segment {i} is empty or whitespace only")
-                else:
-                    print(f"Result {i} has no alternatives")
-            
-            transcript = " ".join(transcript_parts)
-            print(f"Final combined transcript: '{transcript}' (parts: {len(transcript_parts)})")
+        # --- STEP 2: Intent Analysis with Gemini ---
+        if transcript == NO_SPEECH_TRANSCRIPT:
+            # Nothing to answer; the canned reply's audio is pre-warmed in the TTS cache
+            response_text = NO_SPEECH_RESPONSE
         else:
-            print("No speech results found")
-        
-        if not transcript.strip():
-            print("Setting transcript to 'No speech detected' because final transcript is empty")
-            transcript = "No speech detected."
+            structured_prompt = f"""
+            Teacher said: "{transcript}".
+            Respond in this JSON format:
+            {{"answer": "Your short, helpful response for the teacher."}}
+            Do NOT include any explanation, reasoning, or additional text.
+            """
+
+            # Cached Gemini call; near-duplicate questions reuse a previous answer
+            ai_text = await llm_cache.generate(structured_prompt, semantic_key=transcript)
+            try:
+                parsed_response = parse_json_response(ai_text)
+                response_text = parsed_response.get("answer", "").strip()
+            except json.JSONDecodeError:
+                # Fallback if model returns plain text
+                response_text = ai_text.strip().split("\n")[0]
 
-        # --- STEP 2: Intent Analysis with Gemini ---
-        structured_prompt = f"""
-        Teacher said: "{transcript}".
-        Respond in this JSON format:
-        {{"answer": "Your short, helpful response for the teacher."}}
-        Do NOT include any explanation, reasoning, or additional text.
-        """
-
-        ai_response = model.generate_content(structured_prompt)
-        raw_text = ai_response.text.strip()
-        if raw_text.startswith("```"):
-            raw_text = raw_text.strip("`").replace("json", "").strip()
-        try:
-            parsed_response = json.loads(raw_text)
-            response_text = parsed_response.get("answer", "").strip()
-        except json.JSONDecodeError:
-            # Fallback if model returns plain text
-            response_text = ai_response.text.strip().split("\n")[0]
-
-        # If still empty, return default
-        if not response_text:
-            response_text = "I couldn't understand the command. Please try again."
+            # If still empty, return default
+            if not response_text:
+                response_text = "I couldn't understand the command. Please try again."
 
         # --- STEP 3: Convert AI Response to Speech ---
-        try:
-            # Use the robust TTS function with retry logic
-            audio_content = generate_tts_audio_with_retry(response_text, max_retries=3)
-            
-        except Exception as tts_error:
-            print(f"❌ TTS generation failed completely: {tts_error}")
-            # Use fallback audio
-            audio_content = create_fallback_audio(response_text)
-
-        # Save audio file with validation
-        unique_filename = f"ai_response_{uuid.uuid4().hex[:8]}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp3"
+        unique_filename = audio_filename("ai_response")
         audio_output_path = os.path.join(AUDIO_FILES_DIR, unique_filename)
         
-        with open(audio_output_path, "wb") as out:
-            out.write(audio_content)
+        # Reuse previously synthesized audio for identical responses
+        if not await asyncio.to_thread(tts_cache.copy_to, response_text, TTS_VOICE_NAME, "MP3", audio_output_path):
+            try:
+                # Use the robust TTS function with retry logic
+                audio_content = await asyncio.to_thread(generate_tts_audio_with_retry, response_text, max_retries=3)
+                await asyncio.to_thread(tts_cache.store, response_text, TTS_VOICE_NAME, "MP3", audio_content)
+                
+            except Exception as tts_error:
+                logger.error("TTS generation failed completely: %s", tts_error)
+                # Use fallback audio
+                audio_content = create_fallback_audio(response_text)
+
+            # Save audio file with validation
+            with open(audio_output_path, "wb") as out:
+                out.write(audio_content)
         
         # Verify file was written correctly
         if not os.path.exists(audio_output_path) or os.path.getsize(audio_output_path) == 0:
             raise Exception("Failed to create valid audio file")
         
-        print(f"✅ Audio file created: {unique_filename} ({os.path.getsize(audio_output_path)} bytes)")
+        logger.debug("Audio file created: %s", unique_filename)
 
         return {
             "status": "success",
@@ -350,13 +641,6 @@ async def process_voice_command(audio_file) -> dict:
             "error": str(e)
         }
 
-    finally:
-        if audio_path and os.path.exists(audio_path):
-            try:
-                os.unlink(audio_path)
-            except:
-                pass
-
 async def process_text_command(text: str, context: dict = None) -> dict:
     """
     Process text command directly without speech-to-text conversion
@@ -390,15 +674,12 @@ Response format: {{"answer": "Your response here"}}
 """
         
         try:
-            ai_response = model.generate_content(educational_prompt)
+            ai_response = await asyncio.to_thread(model.generate_content, educational_prompt)
             raw_text = ai_response.text.strip()
             
             # Try to parse JSON response
-            if raw_text.startswith("```"):
-                raw_text = raw_text.strip("`").replace("json", "").strip()
-            
             try:
-                parsed_response = json.loads(raw_text)
+                parsed_response = parse_json_response(raw_text)
                 response_text = parsed_response.get("answer", "").strip()
             except json.JSONDecodeError:
                 # Fallback if model returns plain text
@@ -414,15 +695,15 @@ Response format: {{"answer": "Your response here"}}
         # --- STEP 2: Convert AI Response to Speech ---
         try:
             # Use the robust TTS function with retry logic
-            audio_content = generate_tts_audio_with_retry(response_text, max_retries=3)
+            audio_content = await asyncio.to_thread(generate_tts_audio_with_retry, response_text, max_retries=3)
             
         except Exception as tts_error:
-            print(f"❌ TTS generation failed completely: {tts_error}")
+            logger.error("TTS generation failed completely: %s", tts_error)
             # Use fallback audio
             audio_content = create_fallback_audio(response_text)
 
         # Save audio file
-        unique_filename = f"response_{uuid.uuid4().hex[:8]}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp3"
+        unique_filename = audio_filename("response")
         audio_output_path = os.path.join(AUDIO_FILES_DIR, unique_filename)
         
         with open(audio_output_path, "wb") as out:
@@ -432,7 +713,7 @@ Response format: {{"answer": "Your response here"}}
         if not os.path.exists(audio_output_path) or os.path.getsize(audio_output_path) == 0:
             raise Exception("Failed to create valid audio file")
             
-        print(f"✅ Text command audio file created: {unique_filename} ({os.path.getsize(audio_output_path)} bytes)")
+        logger.debug("Text command audio file created: %s", unique_filename)
 
         return {
             "status": "success",
@@ -4,44 +4,276 @@ Manages conversation sessions, context awareness, and multi-turn dialogue
 """
 
 import logging
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
-import json
-from dataclasses import dataclass, asdict
+import asyncio
+import heapq
+import re
+from typing import Dict, Any, List, Optional, Deque, Set, Tuple, Coroutine
+from datetime import datetime, timedelta, timezone
+from dataclasses import dataclass, field, asdict
+from collections import deque
+from itertools import islice
 
 from dao.voice_assistant_dao import voice_assistant_dao
 from services.voice_assistant_service import process_voice_command as base_process_voice_command, process_text_command
-from services.voice_assistant_service import model, tts_client, AUDIO_FILES_DIR
+from services.voice_assistant_service import transcribe_audio_content, stream_llm_sentences, stream_tts_audio, parse_json_response
+from services.voice_assistant_service import llm_cache, tts_client, tts_cache, AUDIO_FILES_DIR, audio_filename
+from services.voice_assistant_service import NO_SPEECH_TRANSCRIPT, NO_SPEECH_RESPONSE, MIN_UPLOAD_BYTES, read_audio_upload
+from services.llm_cache import SUMMARY_TTL_SECONDS
 from google.cloud import texttospeech
+from vertexai.preview import caching
+from vertexai.preview.generative_models import GenerativeModel
+from config import Config
 import uuid
 import os
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# More natural voice for conversational responses
+SESSION_VOICE_NAME = "en-US-Journey-F"
+
+# Synthesis settings are constant, so the protobuf messages are built once
+_VOICE_PARAMS = texttospeech.VoiceSelectionParams(
+    language_code="en-US",
+    name=SESSION_VOICE_NAME
+)
+_AUDIO_CFG = texttospeech.AudioConfig(
+    audio_encoding=texttospeech.AudioEncoding.MP3
+)
+
+# Vertex context caching for long conversation histories
+CONTEXT_CACHE_MIN_TURNS = 3
+CONTEXT_CACHE_MIN_CHARS = 4 * 4096  # Vertex rejects caches below its minimum token count (~4 chars per token)
+CONTEXT_CACHE_TTL = timedelta(minutes=30)
+
+# Prompt templates, filled in per turn with str.format
+_TURN_PROMPT_TEMPLATE = """
+Current topic: {topic}
+Conversation summary: {summary}
+
+Teacher now said: "{transcript}"
+
+Provide a contextually aware response that:
+1. References previous conversation if relevant
+2. Maintains conversation flow
+3. Shows understanding of the ongoing topic
+4. Responds helpfully to the teacher's current request
+
+Also name the conversation topic in 2-3 words (e.g., "Math Education", "Classroom Management").
+
+Respond in this JSON format:
+{{"answer": "Your contextually aware response for the teacher.", "topic": "Topic in 2-3 words"}}
+"""
+
+_SUMMARY_PROMPT_TEMPLATE = """
+Summarize this conversation in 1-2 sentences, focusing on the main topics and context:
+
+{messages}
+
+Summary:"""
+
+# Plain (escape-free) JSON string fields of a turn reply, matched without a full parse
+_ANSWER_RE = re.compile(r'"answer"\s*:\s*"([^"\\]*)"')
+_TOPIC_RE = re.compile(r'"topic"\s*:\s*"([^"\\]*)"')
+
+# Leading transcript characters used to key cached conversation topics
+TOPIC_KEY_CHARS = 120
+TOPIC_CACHE_PREFIX = "conversation-topic\x00"  # Keeps topic entries apart from prompts in llm_cache
+
+# Pending session-state saves that trigger an early flush
+SESSION_SAVE_BATCH_SIZE = 32
+
+# Per-turn session records waiting to be written; turns beyond this are not logged
+SESSION_LOG_QUEUE_SIZE = 1024
+
+@dataclass(slots=True)
 class ConversationContext:
     """Represents the context of an ongoing conversation"""
     session_id: str
     user_id: str
     created_at: datetime
     last_interaction_at: datetime
-    conversation_history: List[Dict[str, Any]]
+    conversation_history: Deque[Dict[str, Any]]
     context_summary: str = ""
     topic: str = ""
     total_interactions: int = 0
-    session_duration_minutes: float = 0.0
+    is_paused: bool = False
+    paused_at: Optional[datetime] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    context_block: Optional[str] = None  # Formatted history for prompts; None when stale
+    cached_context: Optional[Any] = None  # Vertex CachedContent holding a history prefix
+    cached_context_turn: int = 0  # total_interactions when cached_context was created
+    cached_context_expires_at: Optional[datetime] = None
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False, compare=False)  # Serializes state changes
+    
+    @property
+    def session_duration_minutes(self) -> float:
+        """Minutes between session creation and the latest interaction"""
+        return (self.last_interaction_at - self.created_at).total_seconds() / 60
+
+def _to_ms(when: datetime) -> int:
+    """Naive UTC datetime as integer unix milliseconds"""
+    return int(when.replace(tzinfo=timezone.utc).timestamp() * 1000)
+
+
+class SessionStore:
+    """
+    Index over active sessions
+    
+    Sessions stay addressable by id through ``sessions``. A min-heap of
+    (last-interaction ms, session id) entries makes expiry proportional to the
+    number of sessions actually expiring: every touch pushes a fresh entry and
+    superseded ones are dropped lazily when they reach the top. ``sessions_by_user``
+    indexes session ids by owner so per-user lookups only touch that user's sessions.
+    """
+    
+    def __init__(self):
+        self.sessions: Dict[str, ConversationContext] = {}
+        self.sessions_by_user: Dict[str, Set[str]] = {}
+        self._last_interaction_ms: Dict[str, int] = {}
+        self._expiry_heap: List[Tuple[int, str]] = []
+    
+    def __len__(self) -> int:
+        return len(self.sessions)
+    
+    def add(self, session: ConversationContext):
+        """Register a session, or replace it and refresh its expiry if already present"""
+        if session.session_id not in self.sessions:
+            self.sessions_by_user.setdefault(session.user_id, set()).add(session.session_id)
+        self.sessions[session.session_id] = session
+        self.touch(session.session_id, session.last_interaction_at)
+    
+    def touch(self, session_id: str, when: datetime):
+        """Record a new last-interaction time for a session"""
+        if session_id not in self.sessions:
+            return
+        when_ms = _to_ms(when)
+        if self._last_interaction_ms.get(session_id) == when_ms:
+            return
+        self._last_interaction_ms[session_id] = when_ms
+        heapq.heappush(self._expiry_heap, (when_ms, session_id))
+    
+    def remove(self, session_id: str):
+        """Drop a session; its heap entries are discarded when they surface"""
+        session = self.sessions.pop(session_id, None)
+        if session is None:
+            return
+        self._last_interaction_ms.pop(session_id, None)
+        user_sessions = self.sessions_by_user.get(session.user_id)
+        if user_sessions is not None:
+            user_sessions.discard(session_id)
+            if not user_sessions:
+                del self.sessions_by_user[session.user_id]
+    
+    def expired_ids(self, cutoff: datetime) -> List[str]:
+        """
+        Pop ids of sessions whose last interaction is older than cutoff
+        
+        Each returned session is only reported again after a new touch, so
+        callers that keep a session (e.g. a paused one) must touch it to have
+        it considered for expiry later.
+        """
+        cutoff_ms = _to_ms(cutoff)
+        expired = []
+        while self._expiry_heap and self._expiry_heap[0][0] < cutoff_ms:
+            when_ms, session_id = heapq.heappop(self._expiry_heap)
+            # Skip entries superseded by a later touch or left by a removed session
+            if self._last_interaction_ms.get(session_id) == when_ms:
+                expired.append(session_id)
+        return expired
+    
+    def ids_for_user(self, user_id: str) -> List[str]:
+        """Ids of all sessions owned by user_id"""
+        return list(self.sessions_by_user.get(user_id, ()))
+
+
+def _recent(history: Deque[Dict[str, Any]], count: int) -> List[Dict[str, Any]]:
+    """Last `count` interactions of a bounded history deque, oldest first"""
+    return list(islice(history, max(0, len(history) - count), None))
+
+
+def _save_session_audio(text: str, audio_content: bytes, audio_output_path: str):
+    """Write synthesized audio once into the TTS cache and link the response file to it"""
+    tts_cache.store(text, SESSION_VOICE_NAME, "MP3", audio_content)
+    if not tts_cache.copy_to(text, SESSION_VOICE_NAME, "MP3", audio_output_path):
+        with open(audio_output_path, "wb") as out:
+            out.write(audio_content)
+
+
+def _format_turns(interactions) -> str:
+    """Interactions as "User said / Assistant said" prompt lines"""
+    return "\n".join(
+        f"User said: {interaction['user_message']}\nAssistant said: {interaction['assistant_response']}"
+        for interaction in interactions
+    )
+
+
+def _context_block(session: ConversationContext) -> str:
+    """Conversation history formatted for prompts, rebuilt only after the history changes"""
+    if session.context_block is None:
+        session.context_block = _format_turns(session.conversation_history)
+    return session.context_block
+
+
+def _session_info(session: ConversationContext) -> Dict[str, Any]:
+    """Public summary of an active session"""
+    return {
+        "session_id": session.session_id,
+        "user_id": session.user_id,
+        "created_at": session.created_at.isoformat(),
+        "last_interaction_at": session.last_interaction_at.isoformat(),
+        "total_interactions": session.total_interactions,
+        "topic": session.topic,
+        "session_duration_minutes": round(session.session_duration_minutes, 2),
+        "context_summary": session.context_summary,
+        "is_active": True
+    }
+
+
+def _parse_turn_reply(ai_text: str) -> Dict[str, Any]:
+    """
+    Extract the answer and topic fields from a turn reply
+    
+    Replies are usually a flat JSON object with plain strings, which the
+    regexes pick out directly. Anything else (escaped quotes, newlines,
+    unicode escapes, missing fields) falls back to a full JSON parse.
+    """
+    answer = _ANSWER_RE.search(ai_text)
+    if answer is not None:
+        topic = _TOPIC_RE.search(ai_text)
+        return {"answer": answer.group(1), "topic": topic.group(1) if topic else ""}
+    return parse_json_response(ai_text)
+
 
 class VoiceSessionService:
     """Enhanced voice service with session management and context awareness"""
     
     def __init__(self):
-        self.active_sessions: Dict[str, ConversationContext] = {}
+        self.session_store = SessionStore()
+        self.active_sessions: Dict[str, ConversationContext] = self.session_store.sessions
         self.session_timeout_minutes = 30  # Sessions expire after 30 minutes
         self.max_context_history = 10  # Keep last 10 interactions for context
         self.max_sessions_per_user = 5  # Maximum concurrent sessions per user
         self.session_recovery_window_hours = 24  # Time window for session recovery
         self.auto_save_interval_minutes = 5  # Auto-save session state interval
         self._last_auto_save: Dict[str, datetime] = {}  # Track last auto-save per session
+        self._pending_saves: Dict[str, Dict[str, Any]] = {}  # Latest unsaved state per session
+        self._flusher: Optional[asyncio.Task] = None
+        self._flush_requested: Optional[asyncio.Event] = None
+        self._session_log_queue: Optional[asyncio.Queue] = None
+        self._session_log_writer: Optional[asyncio.Task] = None
+        self.max_background_tasks = 100  # Side-effect tasks allowed in flight before running inline
+        self._background_tasks: Set[asyncio.Task] = set()  # Strong refs so pending tasks aren't GC'd
+        self._no_speech_audio: Optional[bytes] = None  # Streamed no-speech reply, synthesized on first use
+        
+        # Shared store lets any worker continue a session; Redis expires idle sessions itself
+        self.shared_store = None
+        if Config.REDIS_URL:
+            from services.redis_session_store import RedisSessionStore
+            self.shared_store = RedisSessionStore(
+                Config.REDIS_URL,
+                ttl_seconds=self.session_timeout_minutes * 60,
+                max_history=self.max_context_history
+            )
         
     async def create_session(self, user_id: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Explicitly create a new session with optional metadata
@@ -53,9 +285,16 @@ class VoiceSessionService:
         Returns:
             Dict containing session information
         """
-        # Check concurrent session limit
-        user_sessions = await self.get_user_active_sessions(user_id)
-        if len(user_sessions) >= self.max_sessions_per_user:
+        # Check concurrent session limit without building per-session info
+        if self.shared_store:
+            try:
+                session_count = len(await self.shared_store.user_session_ids(user_id))
+            except Exception as e:
+                logger.warning(f"Failed to count shared sessions for user {user_id}: {e}")
+                session_count = len(self.session_store.sessions_by_user.get(user_id, ()))
+        else:
+            session_count = len(self.session_store.sessions_by_user.get(user_id, ()))
+        if session_count >= self.max_sessions_per_user:
             return {
                 "status": "error",
                 "message": f"Maximum number of concurrent sessions ({self.max_sessions_per_user}) reached",
@@ -99,8 +338,9 @@ class VoiceSessionService:
             await self._auto_save_session(session)
             
             # Mark as paused but keep in memory
-            session.is_paused = True
-            session.paused_at = datetime.utcnow()
+            async with session.lock:
+                session.is_paused = True
+                session.paused_at = datetime.utcnow()
             
             return {
                 "status": "success",
@@ -135,16 +375,17 @@ class VoiceSessionService:
             if user_id and session.user_id != user_id:
                 return {"status": "error", "message": "Unauthorized"}
             
-            if hasattr(session, 'is_paused'):
+            async with session.lock:
                 session.is_paused = False
-                del session.paused_at
-            
-            session.last_interaction_at = datetime.utcnow()
+                session.paused_at = None
+                
+                session.last_interaction_at = datetime.utcnow()
+                self.session_store.touch(session_id, session.last_interaction_at)
             
             return {
                 "status": "success",
                 "message": "Session resumed successfully",
-                "session_info": await self.get_session_info(session_id)
+                "session_info": _session_info(session)
             }
             
         except Exception as e:
@@ -166,13 +407,14 @@ class VoiceSessionService:
             dict: Enhanced response with session information
         """
         try:
+            # One clock read serves every timestamp of this request
+            now = datetime.utcnow()
+            
             # Get or create session
-            session = await self._get_or_create_session(user_id, session_id)
+            session = await self._get_or_create_session(user_id, session_id, now=now)
             
             # Add context to session metadata if provided
             if context:
-                if not hasattr(session, 'metadata'):
-                    session.metadata = {}
                 session.metadata.update(context)
             
             # Process the voice command using base service
@@ -181,6 +423,30 @@ class VoiceSessionService:
             if base_result["status"] == "error":
                 return base_result
             
+            if base_result["transcript"] == NO_SPEECH_TRANSCRIPT:
+                # Nothing was said: return the canned reply and its cached audio
+                # without touching Gemini, the session history or the conversation log
+                return {
+                    "status": "success",
+                    "transcript": base_result["transcript"],
+                    "ai_response": base_result["ai_response"],
+                    "audio_filename": base_result["audio_filename"],
+                    "audio_file_path": base_result["audio_file_path"],
+                    "download_url": f"/voice/download-audio/{base_result['audio_filename']}",
+                    "session_info": {
+                        "session_id": session.session_id,
+                        "interaction_number": session.total_interactions,
+                        "topic": session.topic,
+                        "session_duration_minutes": round(session.session_duration_minutes, 2),
+                        "context_used": False
+                    },
+                    "conversation_id": None,
+                    "metadata": {
+                        "processed_at": now.isoformat(),
+                        "enhanced_with_context": False
+                    }
+                }
+            
             # Enhance AI response with conversation context
             enhanced_response = await self._enhance_response_with_context(
                 transcript=base_result["transcript"],
@@ -188,31 +454,17 @@ class VoiceSessionService:
                 session=session
             )
             
-            # Update session with new interaction
-            await self._update_session_context(session, base_result["transcript"], enhanced_response)
-            
-            # Generate enhanced audio response
-            enhanced_audio = await self._generate_contextual_audio(enhanced_response)
-            
-            # Save conversation with session context
-            conversation_data = {
-                "user_id": user_id,
-                "session_id": session.session_id,
-                "transcript": base_result["transcript"],
-                "ai_response": enhanced_response,
-                "audio_filename": enhanced_audio["filename"],
-                "context_used": True,
-                "interaction_number": session.total_interactions,
-                "topic": session.topic,
-                "created_at": datetime.utcnow(),
-                "metadata": {
-                    "session_duration_minutes": session.session_duration_minutes,
-                    "context_summary": session.context_summary[:200] + "..." if len(session.context_summary) > 200 else session.context_summary
-                }
-            }
+            # Record the interaction and synthesize the reply concurrently; neither needs the other
+            _, enhanced_audio = await asyncio.gather(
+                self._update_session_context(session, base_result["transcript"], enhanced_response, now=now),
+                self._generate_contextual_audio(enhanced_response)
+            )
             
-            # Store in database
-            conversation_id = voice_assistant_dao.save_conversation(user_id, conversation_data)
+            # Store in database without holding up the reply
+            conversation_id = uuid.uuid4().hex
+            await self._save_conversation_in_background(
+                session, conversation_id, base_result["transcript"], enhanced_response, enhanced_audio["filename"], now
+            )
             
             return {
                 "status": "success",
@@ -230,7 +482,7 @@ class VoiceSessionService:
                 },
                 "conversation_id": conversation_id,
                 "metadata": {
-                    "processed_at": datetime.utcnow().isoformat(),
+                    "processed_at": now.isoformat(),
                     "enhanced_with_context": True
                 }
             }
@@ -243,88 +495,323 @@ class VoiceSessionService:
                 "ai_response": "I encountered an error processing your request. Please try again."
             }
     
-    async def _get_or_create_session(self, user_id: str, session_id: Optional[str] = None) -> ConversationContext:
-        """Get existing session or create new one"""
+    async def stream_session_voice_command(self, audio_file, user_id: str, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Process a voice command and stream the spoken reply as it is generated
+        
+        Speech-to-text runs up front; the Gemini answer is then streamed sentence
+        by sentence into a streaming TTS call, so the first audio bytes reach the
+        client long before the full reply exists.
+        
+        Args:
+            audio_file: Uploaded audio file
+            user_id: User identifier
+            session_id: Optional session ID for continuing conversation
+            
+        Returns:
+            dict: status, session_id, conversation_id, transcript and "audio_stream",
+            an async iterator of STREAMING_TTS_ENCODING (Ogg Opus) chunks
+        """
+        file_extension = audio_file.filename.split('.')[-1].lower() if audio_file.filename else 'wav'
+        
+        content = await read_audio_upload(audio_file)
+        if content is None:
+            return {"status": "error", "error": "File size exceeds 10MB limit"}
+        if len(content) < MIN_UPLOAD_BYTES:
+            return {"status": "error", "error": "File size too small"}
+        
+        now = datetime.utcnow()
+        session = await self._get_or_create_session(user_id, session_id, now=now)
+        try:
+            transcript = await transcribe_audio_content(content, file_extension)
+        except Exception as e:
+            logger.error(f"Speech recognition failed for streamed session command: {e}")
+            return {
+                "status": "error",
+                "transcript": "Error processing audio",
+                "ai_response": "I encountered an error processing your request. Please try again.",
+                "error": str(e)
+            }
+        
+        if transcript == NO_SPEECH_TRANSCRIPT:
+            # Nothing to answer; the canned reply skips Gemini and is synthesized once per process
+            return {
+                "status": "success",
+                "session_id": session.session_id,
+                "conversation_id": None,
+                "transcript": transcript,
+                "audio_stream": self._stream_no_speech_audio()
+            }
+        
+        prompt = f"""
+Previous conversation context:
+{_context_block(session) or "None"}
+
+Current topic: {session.topic}
+
+Teacher now said: "{transcript}"
+
+Reply with a short, helpful spoken answer for the teacher in plain sentences.
+Do NOT use JSON, markdown, or lists.
+"""
+        
+        # Known before the reply exists, so the client gets it with the response headers
+        conversation_id = uuid.uuid4().hex
+        
+        return {
+            "status": "success",
+            "session_id": session.session_id,
+            "conversation_id": conversation_id,
+            "transcript": transcript,
+            "audio_stream": self._stream_reply_audio(prompt, transcript, session, conversation_id, now)
+        }
+    
+    async def _stream_reply_audio(self, prompt: str, transcript: str, session: ConversationContext, conversation_id: str, now: datetime):
+        """Feed streamed reply sentences into one streaming TTS call and yield its audio; records the turn when done"""
+        
+        sentences = []
+        
+        async def reply_sentences():
+            async for sentence in stream_llm_sentences(prompt):
+                sentences.append(sentence)
+                yield sentence
+        
+        try:
+            async for chunk in stream_tts_audio(reply_sentences(), _VOICE_PARAMS):
+                yield chunk
+        except Exception as e:
+            # Headers are already sent, so end the stream cleanly rather than abort the response
+            logger.error(f"Streaming reply failed for session {session.session_id}: {e}")
+            return
+        
+        if sentences:
+            ai_response = " ".join(sentences)
+            await self._update_session_context(session, transcript, ai_response, now=now)
+            # The audio went straight to the client, so there is no file to reference
+            await self._save_conversation_in_background(session, conversation_id, transcript, ai_response, None, now)
+    
+    async def _stream_no_speech_audio(self):
+        """Yield the spoken no-speech reply, synthesizing it on first use"""
+        if self._no_speech_audio is None:
+            async def reply_sentences():
+                yield NO_SPEECH_RESPONSE
+            
+            try:
+                chunks = [chunk async for chunk in stream_tts_audio(reply_sentences(), _VOICE_PARAMS)]
+            except Exception as e:
+                logger.error(f"No-speech reply synthesis failed: {e}")
+                return
+            self._no_speech_audio = b"".join(chunks)
+        yield self._no_speech_audio
+    
+    async def _save_conversation_in_background(self, session: ConversationContext, conversation_id: str, transcript: str, ai_response: str, audio_filename: Optional[str], now: datetime):
+        """Store a session turn through the DAO without holding up the reply"""
+        conversation_data = {
+            "user_id": session.user_id,
+            "session_id": session.session_id,
+            "transcript": transcript,
+            "ai_response": ai_response,
+            "audio_filename": audio_filename,
+            "context_used": True,
+            "interaction_number": session.total_interactions,
+            "topic": session.topic,
+            "created_at": now,
+            "metadata": {
+                "session_duration_minutes": session.session_duration_minutes,
+                "context_summary": session.context_summary[:200] + "..." if len(session.context_summary) > 200 else session.context_summary
+            }
+        }
+        await self._run_in_background(
+            asyncio.to_thread(voice_assistant_dao.save_conversation, session.user_id, conversation_data, conversation_id)
+        )
+    
+    async def _get_or_create_session(self, user_id: str, session_id: Optional[str] = None, now: Optional[datetime] = None) -> ConversationContext:
+        """Get existing session or create new one; `now` lets callers reuse their request timestamp"""
+        now = now or datetime.utcnow()
         
         # Clean up expired sessions
-        await self._cleanup_expired_sessions()
+        await self._cleanup_expired_sessions(now)
+        
+        # With a shared store, Redis holds the authoritative copy (another worker may have advanced it)
+        if session_id and self.shared_store:
+            session = await self._load_shared_session(session_id)
+            if session:
+                session.last_interaction_at = now
+                self.session_store.touch(session_id, session.last_interaction_at)
+                return session
         
         if session_id and session_id in self.active_sessions:
             session = self.active_sessions[session_id]
             # Update last interaction time
-            session.last_interaction_at = datetime.utcnow()
-            session.session_duration_minutes = (session.last_interaction_at - session.created_at).total_seconds() / 60
+            session.last_interaction_at = now
+            self.session_store.touch(session_id, session.last_interaction_at)
             return session
         
         # Create new session
         new_session_id = f"session_{user_id}_{uuid.uuid4().hex[:8]}"
-        now = datetime.utcnow()
         
         session = ConversationContext(
             session_id=new_session_id,
             user_id=user_id,
             created_at=now,
             last_interaction_at=now,
-            conversation_history=[],
+            conversation_history=deque(maxlen=self.max_context_history),
             total_interactions=0
         )
         
-        self.active_sessions[new_session_id] = session
+        self.session_store.add(session)
         logger.info(f"Created new voice session {new_session_id} for user {user_id}")
         
+        if self.shared_store:
+            try:
+                await self.shared_store.save(session)
+            except Exception as e:
+                logger.warning(f"Failed to share session {new_session_id}: {e}")
+        
+        return session
+    
+    async def _load_shared_session(self, session_id: str) -> Optional[ConversationContext]:
+        """Load a session from the shared store into this worker's memory"""
+        try:
+            state = await self.shared_store.load(session_id)
+        except Exception as e:
+            logger.warning(f"Failed to load shared session {session_id}: {e}")
+            return None
+        
+        if not state:
+            return None
+        
+        local = self.active_sessions.get(session_id)
+        if local is not None:
+            # Refresh in place: a turn already in progress holds this object and its lock.
+            # A stale shared copy (this worker's latest turn not yet written) is ignored.
+            if state["total_interactions"] >= local.total_interactions:
+                local.conversation_history.clear()
+                local.conversation_history.extend(state["conversation_history"])
+                local.context_block = None
+                local.context_summary = state.get("context_summary", "")
+                local.topic = state.get("topic", "")
+                local.total_interactions = state["total_interactions"]
+            return local
+        
+        session = ConversationContext(
+            session_id=session_id,
+            user_id=state["user_id"],
+            created_at=datetime.fromisoformat(state["created_at"]),
+            last_interaction_at=datetime.fromisoformat(state["last_interaction_at"]),
+            conversation_history=deque(state["conversation_history"], maxlen=self.max_context_history),
+            context_summary=state.get("context_summary", ""),
+            topic=state.get("topic", ""),
+            total_interactions=state["total_interactions"]
+        )
+        self.session_store.add(session)
         return session
     
     async def _enhance_response_with_context(self, transcript: str, base_response: str, session: ConversationContext) -> str:
         """Enhance AI response using conversation context"""
         
-        if not session.conversation_history:
-            # First interaction - just return base response but identify topic
-            await self._identify_conversation_topic(transcript, session)
+        if transcript == NO_SPEECH_TRANSCRIPT:
+            # Nothing was said; keep the canned reply and its cached audio
             return base_response
         
-        # Build context from conversation history
-        context_messages = []
-        for interaction in session.conversation_history[-self.max_context_history:]:
-            context_messages.append(f"User said: {interaction['user_message']}")
-            context_messages.append(f"Assistant said: {interaction['assistant_response']}")
+        if not session.conversation_history:
+            # First interaction - just return base response; topic is identified in the background
+            await self._run_in_background(self._identify_conversation_topic(transcript, session))
+            return base_response
         
-        context_prompt = f"""
-Previous conversation context:
-{chr(10).join(context_messages)}
-
-Current topic: {session.topic}
-Conversation summary: {session.context_summary}
-
-Teacher now said: "{transcript}"
-
-Provide a contextually aware response that:
-1. References previous conversation if relevant
-2. Maintains conversation flow
-3. Shows understanding of the ongoing topic
-4. Responds helpfully to the teacher's current request
-
-Respond in this JSON format:
-{{"answer": "Your contextually aware response for the teacher."}}
-"""
+        turn_prompt = _TURN_PROMPT_TEMPLATE.format(
+            topic=session.topic,
+            summary=session.context_summary,
+            transcript=transcript
+        )
         
         try:
-            ai_response = model.generate_content(context_prompt)
-            raw_text = ai_response.text.strip()
-            if raw_text.startswith("```"):
-                raw_text = raw_text.strip("`").replace("json", "").strip()
-            
-            parsed_response = json.loads(raw_text)
+            cached_model = await self._get_context_cache_model(session)
+            if cached_model is not None:
+                # History up to the cache point is already on the model; send only what came after
+                newer_context = _format_turns(
+                    _recent(session.conversation_history, session.total_interactions - session.cached_context_turn)
+                )
+                response = await asyncio.to_thread(cached_model.generate_content, f"{newer_context}\n{turn_prompt}")
+                ai_text = response.text
+            else:
+                context_prompt = f"""
+Previous conversation context:
+{_context_block(session)}
+{turn_prompt}"""
+                ai_text = await llm_cache.generate(context_prompt)
+            parsed_response = _parse_turn_reply(ai_text)
             enhanced_response = parsed_response.get("answer", base_response).strip()
             
+            # Topic comes back in the same response, saving a separate Gemini call
+            topic = str(parsed_response.get("topic", "")).strip().replace('"', '')[:50]
+            if topic:
+                session.topic = topic
+            
             return enhanced_response if enhanced_response else base_response
             
         except Exception as e:
             logger.warning(f"Context enhancement failed, using base response: {e}")
             return base_response
     
+    async def _get_context_cache_model(self, session: ConversationContext):
+        """
+        Model bound to a Vertex context cache of the session's history
+        
+        The cache is created once the history is long enough to qualify and
+        refreshed every max_context_history turns or when it expires.
+        
+        Returns:
+            GenerativeModel using the cached prefix, or None to send the full prompt
+        """
+        now = datetime.utcnow()
+        cache_is_fresh = (
+            session.cached_context is not None
+            and session.cached_context_expires_at > now
+            and session.total_interactions - session.cached_context_turn < self.max_context_history
+        )
+        
+        if not cache_is_fresh:
+            # Drop the outdated cache on Vertex before creating its replacement
+            await self._release_context_cache(session)
+            if session.total_interactions < CONTEXT_CACHE_MIN_TURNS or len(_context_block(session)) < CONTEXT_CACHE_MIN_CHARS:
+                return None
+            try:
+                session.cached_context = await asyncio.to_thread(
+                    caching.CachedContent.create,
+                    model_name=Config.GOOGLE_GEMINI_MODEL,
+                    contents=[f"Previous conversation context:\n{_context_block(session)}"],
+                    ttl=CONTEXT_CACHE_TTL
+                )
+            except Exception as e:
+                logger.warning(f"Context cache creation failed for session {session.session_id}: {e}")
+                return None
+            session.cached_context_turn = session.total_interactions
+            # Refresh a little before Vertex drops the cache
+            session.cached_context_expires_at = now + CONTEXT_CACHE_TTL - timedelta(minutes=1)
+        
+        return GenerativeModel.from_cached_content(cached_content=session.cached_context)
+    
+    async def _release_context_cache(self, session: ConversationContext):
+        """Delete the session's Vertex context cache, which is billed until deleted or expired"""
+        cached_context = session.cached_context
+        if cached_context is None:
+            return
+        session.cached_context = None
+        try:
+            await asyncio.to_thread(cached_context.delete)
+        except Exception as e:
+            logger.warning(f"Context cache deletion failed for session {session.session_id}: {e}")
+    
     async def _identify_conversation_topic(self, transcript: str, session: ConversationContext):
         """Identify and set the conversation topic"""
         
+        # The topic is decided by the opening words; normalizing them lets repeated
+        # openings reuse a known topic. The key is only used for cache lookups, the
+        # model still sees the transcript as spoken.
+        transcript_key = " ".join(transcript.split())[:TOPIC_KEY_CHARS].lower()
+        local_key = f"{TOPIC_CACHE_PREFIX}{transcript_key}"
+        
         topic_prompt = f"""
 Analyze this teacher's voice message and identify the main topic/subject:
 "{transcript}"
@@ -332,35 +819,67 @@ Analyze this teacher's voice message and identify the main topic/subject:
 Return just the topic in 2-3 words (e.g., "Math Education", "Classroom Management", "Student Assessment").
 """
         
+        topic = llm_cache.get(local_key)
+        if not topic and self.shared_store:
+            # Another worker may already have identified this opening
+            try:
+                topic = await self.shared_store.get_topic(transcript_key)
+            except Exception as e:
+                logger.warning(f"Shared topic lookup failed: {e}")
+            if topic:
+                llm_cache.set(local_key, topic, SUMMARY_TTL_SECONDS)
+        
         try:
-            topic_response = model.generate_content(topic_prompt)
-            topic = topic_response.text.strip().replace('"', '')[:50]  # Limit length
+            if not topic:
+                topic_text = await llm_cache.generate(topic_prompt, ttl=SUMMARY_TTL_SECONDS)
+                topic = topic_text.strip().replace('"', '')[:50]  # Limit length
+                if topic:
+                    llm_cache.set(local_key, topic, SUMMARY_TTL_SECONDS)
+                    if self.shared_store:
+                        try:
+                            await self.shared_store.set_topic(transcript_key, topic, SUMMARY_TTL_SECONDS)
+                        except Exception as e:
+                            logger.warning(f"Failed to share identified topic: {e}")
             session.topic = topic
             logger.info(f"Identified conversation topic: {topic}")
         except Exception as e:
             logger.warning(f"Topic identification failed: {e}")
             session.topic = "General Education"
+        
+        # Runs in the background, so share the topic once it is known
+        if self.shared_store:
+            try:
+                await self.shared_store.save(session)
+            except Exception as e:
+                logger.warning(f"Failed to share topic for session {session.session_id}: {e}")
     
-    async def _update_session_context(self, session: ConversationContext, transcript: str, ai_response: str):
+    async def _update_session_context(self, session: ConversationContext, transcript: str, ai_response: str, now: Optional[datetime] = None):
         """Update session with new interaction"""
+        now = now or datetime.utcnow()
         
         # Add to conversation history
         interaction = {
             "user_message": transcript,
             "assistant_response": ai_response,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": now.isoformat()
         }
         
-        session.conversation_history.append(interaction)
-        session.total_interactions += 1
-        
-        # Keep only recent interactions for context
-        if len(session.conversation_history) > self.max_context_history:
-            session.conversation_history = session.conversation_history[-self.max_context_history:]
+        async with session.lock:
+            # Bounded deque evicts the oldest interaction once max_context_history is reached
+            session.conversation_history.append(interaction)
+            session.context_block = None
+            session.total_interactions += 1
+            
+            # Update context summary periodically, off the response path
+            if session.total_interactions % 3 == 0:  # Every 3 interactions
+                await self._run_in_background(self._update_context_summary(session))
         
-        # Update context summary periodically
-        if session.total_interactions % 3 == 0:  # Every 3 interactions
-            await self._update_context_summary(session)
+        if self.shared_store:
+            try:
+                await self.shared_store.append_history(session.session_id, interaction)
+                await self.shared_store.save(session)
+            except Exception as e:
+                logger.warning(f"Failed to share session update {session.session_id}: {e}")
     
     async def _update_context_summary(self, session: ConversationContext):
         """Generate a summary of the conversation context"""
@@ -369,75 +888,92 @@ Return just the topic in 2-3 words (e.g., "Math Education", "Classroom Managemen
             return
         
         # Create summary of recent interactions
-        recent_messages = []
-        for interaction in session.conversation_history[-6:]:  # Last 6 interactions
-            recent_messages.append(f"User: {interaction['user_message']}")
-            recent_messages.append(f"Assistant: {interaction['assistant_response']}")
-        
-        summary_prompt = f"""
-Summarize this conversation in 1-2 sentences, focusing on the main topics and context:
-
-{chr(10).join(recent_messages)}
-
-Summary:"""
+        recent_messages = "\n".join(
+            f"User: {interaction['user_message']}\nAssistant: {interaction['assistant_response']}"
+            for interaction in _recent(session.conversation_history, 6)  # Last 6 interactions
+        )
+        summary_prompt = _SUMMARY_PROMPT_TEMPLATE.format(messages=recent_messages)
         
         try:
-            summary_response = model.generate_content(summary_prompt)
-            session.context_summary = summary_response.text.strip()[:300]  # Limit length
+            summary_text = await llm_cache.generate(summary_prompt, ttl=SUMMARY_TTL_SECONDS)
+            session.context_summary = summary_text.strip()[:300]  # Limit length
+            if self.shared_store:
+                await self.shared_store.save(session)
         except Exception as e:
             logger.warning(f"Context summary update failed: {e}")
     
+    async def _run_in_background(self, coro: Coroutine):
+        """Schedule a side-effect coroutine without waiting for it; runs inline once too many are pending"""
+        if len(self._background_tasks) >= self.max_background_tasks:
+            await coro
+            return
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+    
     async def _generate_contextual_audio(self, text: str) -> Dict[str, str]:
         """Generate audio with appropriate voice settings for contextual response"""
         
-        synthesis_input = texttospeech.SynthesisInput(text=text)
-        
-        # Use a slightly different voice for contextual responses
-        voice_params = texttospeech.VoiceSelectionParams(
-            language_code="en-US",
-            name="en-US-Journey-F"  # More natural voice for conversations
-        )
+        unique_filename = audio_filename("session_response")
+        audio_output_path = os.path.join(AUDIO_FILES_DIR, unique_filename)
         
-        audio_config = texttospeech.AudioConfig(
-            audio_encoding=texttospeech.AudioEncoding.MP3
-        )
+        # Identical responses reuse previously synthesized audio
+        if await asyncio.to_thread(tts_cache.copy_to, text, SESSION_VOICE_NAME, "MP3", audio_output_path):
+            return {
+                "filename": unique_filename,
+                "path": audio_output_path
+            }
         
-        tts_response = tts_client.synthesize_speech(
-            input=synthesis_input, 
-            voice=voice_params, 
-            audio_config=audio_config
+        # Use a slightly different voice for contextual responses
+        tts_response = await asyncio.to_thread(
+            tts_client.synthesize_speech,
+            input=texttospeech.SynthesisInput(text=text),
+            voice=_VOICE_PARAMS,
+            audio_config=_AUDIO_CFG
         )
         
-        # Save audio file
-        unique_filename = f"session_response_{uuid.uuid4().hex[:8]}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp3"
-        audio_output_path = os.path.join(AUDIO_FILES_DIR, unique_filename)
-        
-        with open(audio_output_path, "wb") as out:
-            out.write(tts_response.audio_content)
+        # Save audio file off the event loop
+        await asyncio.to_thread(_save_session_audio, text, tts_response.audio_content, audio_output_path)
         
         return {
             "filename": unique_filename,
             "path": audio_output_path
         }
     
-    async def _cleanup_expired_sessions(self):
+    async def _cleanup_expired_sessions(self, now: Optional[datetime] = None):
         """Remove expired sessions from memory"""
         
-        cutoff_time = datetime.utcnow() - timedelta(minutes=self.session_timeout_minutes)
+        cutoff_time = (now or datetime.utcnow()) - timedelta(minutes=self.session_timeout_minutes)
+        
+        if self.shared_store:
+            # Redis expires idle sessions through key TTLs. This worker's heap only
+            # knows the turns it served, and other workers may have kept the session
+            # alive, so only the local copy is evicted; the shared one is left alone.
+            for session_id in self.session_store.expired_ids(cutoff_time):
+                session = self.active_sessions[session_id]
+                if not session.is_paused:
+                    self.session_store.remove(session_id)
+                    await self._run_in_background(self._release_context_cache(session))
+            return
+        
         expired_sessions = []
         
-        for session_id, session in self.active_sessions.items():
-            if session.last_interaction_at < cutoff_time:
-                # Don't expire paused sessions
-                if hasattr(session, 'is_paused') and session.is_paused:
-                    continue
-                    
-                expired_sessions.append(session_id)
-                # Auto-save before expiring
-                try:
-                    await self._auto_save_session(session)
-                except Exception as e:
-                    logger.error(f"Failed to auto-save expired session {session_id}: {e}")
+        # Only sessions past the cutoff come off the expiry heap
+        for session_id in self.session_store.expired_ids(cutoff_time):
+            session = self.active_sessions[session_id]
+            # Don't expire paused sessions
+            if session.is_paused:
+                continue
+                
+            expired_sessions.append(session_id)
+            # Auto-save before expiring
+            try:
+                await self._auto_save_session(session)
+            except Exception as e:
+                logger.error(f"Failed to auto-save expired session {session_id}: {e}")
+        
+        # Persist the expiring sessions together before they leave memory
+        await self._flush_session_saves()
         
         for session_id in expired_sessions:
             await self.delete_session(session_id)
@@ -453,28 +989,89 @@ Summary:"""
             (now - last_save).total_seconds() > self.auto_save_interval_minutes * 60):
             
             try:
-                session_state = {
-                    "session_id": session.session_id,
-                    "user_id": session.user_id,
-                    "created_at": session.created_at.isoformat(),
-                    "last_interaction_at": session.last_interaction_at.isoformat(),
-                    "conversation_history": session.conversation_history,
-                    "context_summary": session.context_summary,
-                    "topic": session.topic,
-                    "total_interactions": session.total_interactions,
-                    "session_duration_minutes": session.session_duration_minutes,
-                    "is_paused": getattr(session, 'is_paused', False),
-                    "metadata": getattr(session, 'metadata', {}),
-                    "last_saved_at": now.isoformat()
-                }
+                # Snapshot under the lock so history and counters are saved consistently
+                async with session.lock:
+                    session_state = {
+                        "session_id": session.session_id,
+                        "user_id": session.user_id,
+                        "created_at": session.created_at.isoformat(),
+                        "last_interaction_at": session.last_interaction_at.isoformat(),
+                        "conversation_history": list(session.conversation_history),
+                        "context_summary": session.context_summary,
+                        "topic": session.topic,
+                        "total_interactions": session.total_interactions,
+                        "session_duration_minutes": session.session_duration_minutes,
+                        "is_paused": session.is_paused,
+                        "metadata": session.metadata,
+                        "last_saved_at": now.isoformat()
+                    }
                 
-                await voice_assistant_dao.save_session_state(session_state)
-                self._last_auto_save[session.session_id] = now
-                logger.debug(f"Auto-saved session {session.session_id}")
+                # Queued for the next batched write; a newer state replaces an unsaved older one
+                self._pending_saves[session.session_id] = session_state
+                self._ensure_flusher()
+                if len(self._pending_saves) >= SESSION_SAVE_BATCH_SIZE:
+                    self._flush_requested.set()
                 
             except Exception as e:
                 logger.error(f"Failed to auto-save session {session.session_id}: {e}")
+    
+    def _ensure_flusher(self):
+        # Started lazily: the service is created at import time, before any event loop runs
+        if self._flusher is None or self._flusher.done():
+            self._flush_requested = asyncio.Event()
+            self._flusher = asyncio.create_task(self._run_flusher())
+    
+    async def _run_flusher(self):
+        """Write queued session states every auto-save interval, or sooner once a batch fills up"""
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), self.auto_save_interval_minutes * 60)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self._flush_session_saves()
+    
+    async def _flush_session_saves(self):
+        """Write all queued session states in one batched DAO call"""
+        if not self._pending_saves:
+            return
+        
+        states = self._pending_saves
+        self._pending_saves = {}
+        
+        saved = await asyncio.to_thread(voice_assistant_dao.save_session_states_bulk, list(states.values()))
+        if saved:
+            for session_id, state in states.items():
+                self._last_auto_save[session_id] = datetime.fromisoformat(state["last_saved_at"])
+            logger.debug(f"Auto-saved {len(states)} sessions")
+        else:
+            # Requeue unless a newer state arrived while the write was in flight
+            for session_id, state in states.items():
+                self._pending_saves.setdefault(session_id, state)
                 
+    def _ensure_session_log_writer(self):
+        # Started lazily, like the session-state flusher
+        if self._session_log_writer is None or self._session_log_writer.done():
+            if self._session_log_queue is None:
+                self._session_log_queue = asyncio.Queue(maxsize=SESSION_LOG_QUEUE_SIZE)
+            self._session_log_writer = asyncio.create_task(self._run_session_log_writer())
+    
+    async def _run_session_log_writer(self):
+        """Write queued turn records in batches of whatever has accumulated, up to SESSION_SAVE_BATCH_SIZE"""
+        while True:
+            batch = [await self._session_log_queue.get()]
+            while len(batch) < SESSION_SAVE_BATCH_SIZE and not self._session_log_queue.empty():
+                batch.append(self._session_log_queue.get_nowait())
+            
+            try:
+                saved = await asyncio.to_thread(voice_assistant_dao.save_voice_sessions_bulk, batch)
+                if not saved:
+                    # Fall back to individual writes so one bad record does not lose the batch
+                    for session_data in batch:
+                        await voice_assistant_dao.save_voice_session(session_data)
+            except Exception as e:
+                logger.error(f"Failed to write {len(batch)} session records: {e}")
+    
     async def _recover_session(self, session_id: str, user_id: Optional[str] = None) -> Optional[ConversationContext]:
         """Attempt to recover a session from persistent storage"""
         try:
@@ -497,11 +1094,10 @@ Summary:"""
                 user_id=stored_state["user_id"],
                 created_at=datetime.fromisoformat(stored_state["created_at"]),
                 last_interaction_at=datetime.utcnow(),  # Reset last interaction time
-                conversation_history=stored_state["conversation_history"],
+                conversation_history=deque(stored_state["conversation_history"], maxlen=self.max_context_history),
                 context_summary=stored_state["context_summary"],
                 topic=stored_state["topic"],
-                total_interactions=stored_state["total_interactions"],
-                session_duration_minutes=stored_state["session_duration_minutes"]
+                total_interactions=stored_state["total_interactions"]
             )
             
             # Restore additional attributes
@@ -509,7 +1105,7 @@ Summary:"""
             session.metadata = stored_state.get("metadata", {})
             
             # Add to active sessions
-            self.active_sessions[session_id] = session
+            self.session_store.add(session)
             logger.info(f"Successfully recovered session {session_id}")
             
             return session
@@ -528,9 +1124,10 @@ Summary:"""
             Dict containing analytics data
         """
         try:
-            sessions = self.active_sessions.values()
             if user_id:
-                sessions = [s for s in sessions if s.user_id == user_id]
+                sessions = [self.active_sessions[sid] for sid in self.session_store.ids_for_user(user_id)]
+            else:
+                sessions = list(self.active_sessions.values())
                 
             total_sessions = len(sessions)
             total_interactions = sum(s.total_interactions for s in sessions)
@@ -557,22 +1154,8 @@ Summary:"""
     
     async def get_session_info(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get information about an active session"""
-        
-        if session_id not in self.active_sessions:
-            return None
-        
-        session = self.active_sessions[session_id]
-        return {
-            "session_id": session.session_id,
-            "user_id": session.user_id,
-            "created_at": session.created_at.isoformat(),
-            "last_interaction_at": session.last_interaction_at.isoformat(),
-            "total_interactions": session.total_interactions,
-            "topic": session.topic,
-            "session_duration_minutes": round(session.session_duration_minutes, 2),
-            "context_summary": session.context_summary,
-            "is_active": True
-        }
+        session = self.active_sessions.get(session_id)
+        return _session_info(session) if session else None
     
     async def delete_session(self, session_id: str, user_id: Optional[str] = None) -> Dict[str, Any]:
         """Delete a session and clean up associated resources
@@ -613,7 +1196,7 @@ Summary:"""
                     "topic": session.topic,
                     "context_summary": session.context_summary,
                     "session_duration_minutes": session.session_duration_minutes,
-                    "conversation_history": session.conversation_history
+                    "conversation_history": list(session.conversation_history)
                 }
                 
                 # Store in database for history
@@ -623,8 +1206,14 @@ Summary:"""
                 logger.error(f"Failed to archive session data: {e}")
                 # Continue with deletion even if archiving fails
             
-            # Delete from active sessions
-            del self.active_sessions[session_id]
+            # Delete from active sessions, releasing its Vertex context cache off the response path
+            self.session_store.remove(session_id)
+            await self._run_in_background(self._release_context_cache(session))
+            if self.shared_store:
+                try:
+                    await self.shared_store.delete(session_id, session.user_id)
+                except Exception as e:
+                    logger.warning(f"Failed to delete shared session {session_id}: {e}")
             logger.info(f"Session {session_id} deleted successfully")
             
             return {
@@ -650,14 +1239,19 @@ Summary:"""
     async def get_user_active_sessions(self, user_id: str) -> List[Dict[str, Any]]:
         """Get all active sessions for a user"""
         
-        user_sessions = []
-        for session_id, session in self.active_sessions.items():
-            if session.user_id == user_id:
-                session_info = await self.get_session_info(session_id)
-                if session_info:
-                    user_sessions.append(session_info)
+        if self.shared_store:
+            try:
+                session_ids = await self.shared_store.user_session_ids(user_id)
+                for session_id in session_ids:
+                    if session_id not in self.active_sessions:
+                        await self._load_shared_session(session_id)
+            except Exception as e:
+                logger.warning(f"Failed to list shared sessions for user {user_id}: {e}")
         
-        return user_sessions
+        return [
+            _session_info(self.active_sessions[session_id])
+            for session_id in self.session_store.sessions_by_user.get(user_id, ())
+        ]
     
     async def get_conversation_context(self, session_id: str, user_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Return the conversation context for a given session_id"""
@@ -672,7 +1266,7 @@ Summary:"""
             "user_id": session.user_id,
             "topic": session.topic,
             "context_summary": session.context_summary,
-            "conversation_history": session.conversation_history,
+            "conversation_history": list(session.conversation_history),
             "total_interactions": session.total_interactions,
             "created_at": session.created_at.isoformat(),
             "last_interaction_at": session.last_interaction_at.isoformat(),
@@ -692,14 +1286,15 @@ Summary:"""
         Returns:
             Dict containing AI response and session information
         """
+        # One clock read serves every timestamp of this request, including the error reply
+        now = datetime.utcnow()
+        timestamp = now.isoformat()
+        
         try:
             logger.info(f"Processing text command with session for user {user_id}")
             
-            # Clean up expired sessions
-            await self._cleanup_expired_sessions()
-            
-            # Get or create session
-            session = await self._get_or_create_session(user_id, session_id)
+            # Get or create session (expired sessions are cleaned up on the way)
+            session = await self._get_or_create_session(user_id, session_id, now=now)
             
             # Process the text with text command service (not voice command)
             base_response = await process_text_command(text, context or {})
@@ -713,12 +1308,13 @@ Summary:"""
             )
             
             # Update session context
-            await self._update_session_context(session, text, enhanced_response)
+            await self._update_session_context(session, text, enhanced_response, now=now)
             
-            # Update topic if needed
-            await self._identify_conversation_topic(text, session)
+            # Topic is refreshed by the enhancement call; only re-identify when missing or periodically
+            if not session.topic or session.total_interactions % 10 == 0:
+                await self._run_in_background(self._identify_conversation_topic(text, session))
             
-            # Save session to storage
+            # Queue the turn record for the next batched write
             try:
                 session_data = {
                     "session_id": session.session_id,
@@ -726,12 +1322,15 @@ Summary:"""
                     "transcript": text,
                     "ai_response": enhanced_response,
                     "context": context or {},
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": timestamp,
                     "interaction_type": "text",
                     "topic": session.topic,
                     "total_interactions": session.total_interactions
                 }
-                await voice_assistant_dao.save_voice_session(session_data)
+                self._ensure_session_log_writer()
+                self._session_log_queue.put_nowait(session_data)
+            except asyncio.QueueFull:
+                logger.warning(f"Session log queue full, dropping turn record for session {session.session_id}")
             except Exception as e:
                 logger.error(f"Failed to save session: {e}")
             
@@ -743,7 +1342,7 @@ Summary:"""
                 "total_interactions": session.total_interactions,
                 "session_duration_minutes": round(session.session_duration_minutes, 2),
                 "input_type": "text",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": timestamp
             }
             
         except Exception as e:
@@ -753,7 +1352,7 @@ Summary:"""
                 "ai_response": "I apologize, but I encountered an issue processing your request. Please try again.",
                 "error": str(e),
                 "input_type": "text",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": timestamp
             }
 
 # Create singleton instance
@@ -2,28 +2,29 @@
 """
 Test script for audio endpoint
 """
-import requests
+import asyncio
+import httpx
 import os
 
-def test_audio_endpoint():
+async def test_audio_endpoint():
     """Test the audio file serving endpoint"""
     print("🎵 Testing Audio Endpoint")
     print("=" * 30)
     
     # Check if there are any audio files in the activities_audio directory
     audio_dir = os.path.join(os.getcwd(), "activities_audio")
-    if not os.path.exists(audio_dir):
+    # Only one file is needed, so stop scanning at the first match
+    try:
+        with os.scandir(audio_dir) as entries:
+            test_file = next((entry.name for entry in entries if entry.name.endswith('.mp3') and entry.is_file()), None)
+    except FileNotFoundError:
         print("❌ Audio directory doesn't exist")
         return
     
-    audio_files = [f for f in os.listdir(audio_dir) if f.endswith('.mp3')]
-    
-    if not audio_files:
+    if test_file is None:
         print("❌ No audio files found in activities_audio directory")
         return
     
-    # Test with the first audio file
-    test_file = audio_files[0]
     print(f"🎯 Testing with audio file: {test_file}")
     
     # Test the endpoint
@@ -31,7 +32,8 @@ def test_audio_endpoint():
     print(f"📡 Requesting: {url}")
     
     try:
-        response = requests.get(url, timeout=10)
+        async with httpx.AsyncClient(timeout=10) as client:
+            response = await client.get(url)
         print(f"📊 Status Code: {response.status_code}")
         print(f"📋 Headers: {dict(response.headers)}")
         
@@ -41,10 +43,10 @@ def test_audio_endpoint():
         else:
             print(f"❌ Error: {response.text}")
             
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"❌ Request failed: {e}")
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
 
 if __name__ == "__main__":
-    test_audio_endpoint()
+    asyncio.run(test_audio_endpoint())
@@ -68,9 +68,12 @@ async def test_complete_workflow():
     except Exception as e:
         print(f"❌ Complete workflow test failed: {e}")
 
-if __name__ == "__main__":
-    # Test direct TTS function
-    test_tts_timeout_handling()
+async def main():
+    # Test direct TTS function; it blocks, so it runs in a worker thread
+    await asyncio.to_thread(test_tts_timeout_handling)
     
     # Test complete workflow
-    asyncio.run(test_complete_workflow())
+    await test_complete_workflow()
+
+if __name__ == "__main__":
+    asyncio.run(main())
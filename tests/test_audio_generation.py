@@ -11,42 +11,63 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from services.activities_service import _generate_story_audio, _create_fallback_audio_file
 
+TEST_STORY = "Hello! This is a test story about mathematics. Math is all around us in our daily lives."
+TEST_LANGUAGES = ["English", "Spanish", "French", "German", "Hindi"]
+
+# Concurrent TTS calls allowed at once, and how long each may take
+MAX_CONCURRENT_TTS = 4
+TTS_TIMEOUT_SECONDS = 15
+
+def _stat_or_none(path):
+    """os.stat result for path, or None if it does not exist"""
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
+async def _generate_with_limit(semaphore, language):
+    """Generate one language's audio, bounded by the shared semaphore and a per-call timeout"""
+    async with semaphore:
+        return await asyncio.wait_for(_generate_story_audio(TEST_STORY, language), timeout=TTS_TIMEOUT_SECONDS)
+
 async def test_audio_generation():
     """Test audio generation with multiple languages"""
     print("🧪 Testing Audio Generation")
     print("=" * 50)
     
-    # Test story text
-    test_story = "Hello! This is a test story about mathematics. Math is all around us in our daily lives."
-    
-    # Test languages
-    test_languages = ["English", "Spanish", "French", "German", "Hindi"]
+    # All languages are synthesized at once; a slow one times out without holding up the rest
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_TTS)
+    results = await asyncio.gather(
+        *(_generate_with_limit(semaphore, language) for language in TEST_LANGUAGES),
+        return_exceptions=True
+    )
     
-    for language in test_languages:
+    for language, result in zip(TEST_LANGUAGES, results):
         print(f"\n🌍 Testing {language}...")
-        try:
-            # Test audio generation
-            audio_filename = await _generate_story_audio(test_story, language)
-            print(f"✅ Generated audio: {audio_filename}")
-            
-            # Check if file exists
-            audio_path = os.path.join("temp_audio", audio_filename)
-            if os.path.exists(audio_path):
-                file_size = os.path.getsize(audio_path)
-                print(f"📁 File exists: {file_size} bytes")
-            else:
-                print(f"❌ File not found: {audio_path}")
-                
-        except Exception as e:
-            print(f"❌ Error with {language}: {e}")
+        if isinstance(result, Exception):
+            error = "timed out" if isinstance(result, asyncio.TimeoutError) else result
+            print(f"❌ Error with {language}: {error}")
             
             # Test fallback
             print(f"🔄 Testing fallback for {language}...")
             try:
-                fallback_filename = _create_fallback_audio_file(test_story, language)
+                fallback_filename = _create_fallback_audio_file(TEST_STORY, language)
                 print(f"✅ Fallback generated: {fallback_filename}")
             except Exception as fallback_error:
                 print(f"❌ Fallback also failed: {fallback_error}")
+            continue
+        
+        audio_filename = result
+        print(f"✅ Generated audio: {audio_filename}")
+        
+        # Check if file exists
+        audio_path = os.path.join("temp_audio", audio_filename)
+        audio_stat = await asyncio.to_thread(_stat_or_none, audio_path)
+        if audio_stat:
+            file_size = audio_stat.st_size
+            print(f"📁 File exists: {file_size} bytes")
+        else:
+            print(f"❌ File not found: {audio_path}")
     
     print("\n🏁 Audio generation test completed!")
 
@@ -2,11 +2,12 @@
 """
 Test script to verify download functionality
 """
+import asyncio
 import os
-import requests
+import httpx
 import json
 
-def test_download_endpoint():
+async def test_download_endpoint():
     """Test the download endpoint"""
     # Test ID that you mentioned
     test_id = "a8c2b120-8e98-4fc7-b063-b3bdd5823a0d"
@@ -15,7 +16,8 @@ def test_download_endpoint():
     print(f"🔍 Testing download URL: {download_url}")
     
     try:
-        response = requests.get(download_url, timeout=10)
+        async with httpx.AsyncClient(timeout=10) as client:
+            response = await client.get(download_url)
         
         if response.status_code == 200:
             content_type = response.headers.get('content-type', 'unknown')
@@ -41,7 +43,7 @@ def test_download_endpoint():
             print(f"❌ Error {response.status_code}")
             print(f"📄 Response: {response.text}")
             
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         print(f"❌ Could not connect to server. Make sure it's running on port 8000")
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -49,4 +51,4 @@ def test_download_endpoint():
 if __name__ == "__main__":
     print("🧪 Testing Visual Aid Download Endpoint")
     print("=" * 50)
-    test_download_endpoint()
+    asyncio.run(test_download_endpoint())
@@ -4,13 +4,21 @@ Test English audio generation specifically to debug the issue
 import asyncio
 import os
 import sys
-import requests
+import traceback
+import httpx
 
 # Add the current directory to the Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from services.activities_service import generate_interactive_story
 
+def _stat_or_none(path):
+    """os.stat result for path, or None if it does not exist"""
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
 async def test_english_audio():
     """Test English audio generation specifically"""
     
@@ -30,15 +38,16 @@ async def test_english_audio():
         print(f"✅ Story generated successfully!")
         print(f"📊 Story ID: {result.get('story_id')}")
         print(f"📖 Title: {result.get('title')}")
-        print(f"🎵 Audio filename: {result.get('audio_filename')}")
+        audio_filename = result.get('audio_filename')
+        print(f"🎵 Audio filename: {audio_filename}")
         print(f"📝 Story length: {len(result.get('story_text', ''))} characters")
         
         # Check if audio file exists
-        audio_filename = result.get('audio_filename')
         if audio_filename:
             audio_path = os.path.join("temp_audio", audio_filename)
-            if os.path.exists(audio_path):
-                file_size = os.path.getsize(audio_path)
+            audio_stat = await asyncio.to_thread(_stat_or_none, audio_path)
+            if audio_stat:
+                file_size = audio_stat.st_size
                 print(f"✅ Audio file exists: {audio_path} ({file_size} bytes)")
                 
                 # Test HTTP access to the audio file
@@ -47,7 +56,8 @@ async def test_english_audio():
                 print(f"🔗 URL: {audio_url}")
                 
                 try:
-                    response = requests.head(audio_url, timeout=5)
+                    async with httpx.AsyncClient(timeout=5) as client:
+                        response = await client.head(audio_url)
                     if response.status_code == 200:
                         print(f"✅ Audio file accessible via HTTP (Status: {response.status_code})")
                         content_length = response.headers.get('content-length')
@@ -55,7 +65,7 @@ async def test_english_audio():
                             print(f"📏 Content-Length: {content_length} bytes")
                     else:
                         print(f"❌ HTTP access failed (Status: {response.status_code})")
-                except requests.exceptions.RequestException as e:
+                except httpx.HTTPError as e:
                     print(f"⚠️ Cannot test HTTP access (server may not be running): {e}")
                 
             else:
@@ -67,7 +77,6 @@ async def test_english_audio():
         
     except Exception as e:
         print(f"❌ Error during English audio test: {e}")
-        import traceback
         traceback.print_exc()
         return None
 
@@ -79,31 +88,42 @@ async def test_multiple_languages():
     
     languages = ["English", "Spanish", "French", "German", "Hindi"]
     
-    for language in languages:
-        print(f"\n🔤 Testing {language}...")
-        try:
-            result = await generate_interactive_story(
+    # Generate all languages at once; each story is dominated by Gemini and TTS latency
+    results = await asyncio.gather(
+        *(
+            generate_interactive_story(
                 grade=3,
                 topic="Animals",
                 language=language,
                 user_id=f"test_user_{language.lower()}"
             )
-            
-            audio_filename = result.get('audio_filename')
-            if audio_filename:
-                audio_path = os.path.join("temp_audio", audio_filename)
-                if os.path.exists(audio_path):
-                    file_size = os.path.getsize(audio_path)
-                    print(f"✅ {language}: {audio_filename} ({file_size} bytes)")
-                else:
-                    print(f"❌ {language}: File not found - {audio_filename}")
+            for language in languages
+        ),
+        return_exceptions=True
+    )
+    
+    for language, result in zip(languages, results):
+        print(f"\n🔤 Testing {language}...")
+        if isinstance(result, Exception):
+            print(f"❌ {language}: Error - {result}")
+            continue
+        
+        audio_filename = result.get('audio_filename')
+        if audio_filename:
+            audio_path = os.path.join("temp_audio", audio_filename)
+            audio_stat = await asyncio.to_thread(_stat_or_none, audio_path)
+            if audio_stat:
+                file_size = audio_stat.st_size
+                print(f"✅ {language}: {audio_filename} ({file_size} bytes)")
             else:
-                print(f"❌ {language}: No audio filename returned")
-                
-        except Exception as e:
-            print(f"❌ {language}: Error - {e}")
+                print(f"❌ {language}: File not found - {audio_filename}")
+        else:
+            print(f"❌ {language}: No audio filename returned")
+
+async def main():
+    await test_english_audio()
+    await test_multiple_languages()
 
 if __name__ == "__main__":
-    # Run the tests
-    asyncio.run(test_english_audio())
-    asyncio.run(test_multiple_languages())
+    # Run the tests on one event loop
+    asyncio.run(main())
@@ -4,6 +4,7 @@ Test the updated image generation system
 """
 import sys
 import os
+import traceback
 sys.path.append(os.getcwd())
 
 def test_image_generation():
@@ -61,7 +62,6 @@ def test_image_generation():
         print("Make sure all dependencies are installed")
     except Exception as e:
         print(f"❌ Error during test: {e}")
-        import traceback
         traceback.print_exc()
 
 if __name__ == "__main__":
@@ -6,57 +6,73 @@ import asyncio
 import sys
 import os
 import json
+import traceback
 
 # Add the project root to the Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from services.activities_service import generate_interactive_story
 
+REGIONAL_TEST_CASES = [
+    {"grade": 5, "topic": "Mathematics", "language": "Hindi"},
+    {"grade": 3, "topic": "Science", "language": "Spanish"},
+    {"grade": 7, "topic": "History", "language": "French"},
+]
+
+# Stories generated at once; each makes Gemini and TTS calls
+MAX_CONCURRENT_STORIES = 3
+
+def _stat_or_none(path):
+    """os.stat result for path, or None if it does not exist"""
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
+async def _run_case(semaphore, number, test_case):
+    """Generate one test case's story; returns the result or the exception it raised"""
+    async with semaphore:
+        try:
+            return number, test_case, await generate_interactive_story(**test_case), None
+        except Exception as e:
+            return number, test_case, None, e
+
 async def test_regional_story_generation():
     """Test story generation with regional languages"""
     print("🧪 Testing Regional Language Story Generation")
     print("=" * 60)
     
-    # Test cases
-    test_cases = [
-        {"grade": 5, "topic": "Mathematics", "language": "Hindi"},
-        {"grade": 3, "topic": "Science", "language": "Spanish"},
-        {"grade": 7, "topic": "History", "language": "French"},
-    ]
+    # Run the cases concurrently and report each one as soon as it finishes
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_STORIES)
+    cases = [_run_case(semaphore, i, test_case) for i, test_case in enumerate(REGIONAL_TEST_CASES, 1)]
     
-    for i, test_case in enumerate(test_cases, 1):
+    for next_done in asyncio.as_completed(cases):
+        i, test_case, result, error = await next_done
         print(f"\n📚 Test {i}: Grade {test_case['grade']} - {test_case['topic']} in {test_case['language']}")
         print("-" * 50)
         
-        try:
-            # Generate story
-            result = await generate_interactive_story(
-                grade=test_case['grade'],
-                topic=test_case['topic'],
-                language=test_case['language']
-            )
-            
-            print(f"✅ Story generated successfully!")
-            print(f"📖 Title: {result.get('title', 'N/A')[:100]}...")
-            print(f"📝 Story length: {len(result.get('story_text', ''))} characters")
-            print(f"🎵 Audio file: {result.get('audio_filename', 'N/A')}")
-            print(f"🎯 Learning objectives: {len(result.get('learning_objectives', []))}")
-            print(f"📚 Vocabulary words: {len(result.get('vocabulary_words', []))}")
-            
-            # Check if audio file exists
-            audio_filename = result.get('audio_filename', '')
-            if audio_filename:
-                audio_path = os.path.join("temp_audio", audio_filename)
-                if os.path.exists(audio_path):
-                    file_size = os.path.getsize(audio_path)
-                    print(f"🎧 Audio file exists: {file_size} bytes")
-                else:
-                    print(f"❌ Audio file not found: {audio_path}")
-            
-        except Exception as e:
-            print(f"❌ Error generating story: {e}")
-            import traceback
-            traceback.print_exc()
+        if error is not None:
+            print(f"❌ Error generating story: {error}")
+            traceback.print_exception(error)
+            continue
+        
+        print(f"✅ Story generated successfully!")
+        print(f"📖 Title: {result.get('title', 'N/A')[:100]}...")
+        print(f"📝 Story length: {len(result.get('story_text', ''))} characters")
+        print(f"🎵 Audio file: {result.get('audio_filename', 'N/A')}")
+        print(f"🎯 Learning objectives: {len(result.get('learning_objectives', []))}")
+        print(f"📚 Vocabulary words: {len(result.get('vocabulary_words', []))}")
+        
+        # Check if audio file exists
+        audio_filename = result.get('audio_filename', '')
+        if audio_filename:
+            audio_path = os.path.join("temp_audio", audio_filename)
+            audio_stat = await asyncio.to_thread(_stat_or_none, audio_path)
+            if audio_stat:
+                file_size = audio_stat.st_size
+                print(f"🎧 Audio file exists: {file_size} bytes")
+            else:
+                print(f"❌ Audio file not found: {audio_path}")
     
     print(f"\n🏁 Regional language story generation test completed!")
 
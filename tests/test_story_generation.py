@@ -6,36 +6,50 @@ Tests the improved prompt and story generation functionality
 import asyncio
 import sys
 import os
+import traceback
 
 # Add parent directory to path to import modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from services.activities_service import generate_interactive_story
 
+STORY_TEST_CASES = [
+    {"grade": 5, "topic": "Solar System", "language": "English"},
+    {"grade": 3, "topic": "Water Cycle", "language": "English"},
+    {"grade": 8, "topic": "Photosynthesis", "language": "Spanish"},
+]
+
+# Stories generated at once; each makes Gemini and TTS calls
+MAX_CONCURRENT_STORIES = 3
+
+async def _run_case(semaphore, number, test_case):
+    """Generate one test case's story; returns the result or the exception it raised"""
+    async with semaphore:
+        try:
+            return number, test_case, await generate_interactive_story(**test_case), None
+        except Exception as e:
+            return number, test_case, None, e
+
 async def test_story_generation():
     """Test the improved story generation"""
     print("🧪 Testing Interactive Story Generation")
     print("=" * 50)
     
-    # Test parameters
-    test_cases = [
-        {"grade": 5, "topic": "Solar System", "language": "English"},
-        {"grade": 3, "topic": "Water Cycle", "language": "English"},
-        {"grade": 8, "topic": "Photosynthesis", "language": "Spanish"},
-    ]
+    # Run the cases concurrently and report each one as soon as it finishes
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_STORIES)
+    cases = [_run_case(semaphore, i, test_case) for i, test_case in enumerate(STORY_TEST_CASES, 1)]
     
-    for i, test_case in enumerate(test_cases, 1):
+    for next_done in asyncio.as_completed(cases):
+        i, test_case, result, error = await next_done
         print(f"\n📚 Test Case {i}: {test_case}")
         print("-" * 30)
         
+        if error is not None:
+            print(f"❌ Error generating story: {error}")
+            traceback.print_exception(error)
+            continue
+        
         try:
-            # Generate story
-            result = await generate_interactive_story(
-                grade=test_case["grade"],
-                topic=test_case["topic"],
-                language=test_case["language"]
-            )
-            
             # Display results
             print(f"✅ Story generated successfully!")
             print(f"🏷️  Title: {result['title']}")
@@ -52,7 +66,6 @@ async def test_story_generation():
             
         except Exception as e:
             print(f"❌ Error generating story: {e}")
-            import traceback
             traceback.print_exc()
 
 if __name__ == "__main__":
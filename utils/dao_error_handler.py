@@ -6,19 +6,30 @@ across the application. It ensures that database failures are properly handled
 and appropriate exceptions are raised.
 """
 
+import asyncio
 import logging
-from typing import Optional, Any, Callable
+import os
+from typing import Optional, Callable
 from functools import wraps
 
 logger = logging.getLogger(__name__)
 
+# Skip DAO error translation so DAO calls run unwrapped (raw exceptions reach services).
+# Read once here rather than through config, which sets up Firebase and Vertex on import.
+_DAO_WRAP_DISABLED = os.getenv("DISABLE_DAO_ERROR_WRAPPING", "false").lower() == "true"
+
 class DAOError(Exception):
-    """Base exception for DAO-related errors"""
+    """Base exception for DAO-related errors; the message is built only when read"""
     def __init__(self, operation: str, details: str, original_error: Optional[Exception] = None):
+        # args must be set explicitly: DAOs raise with keyword arguments, which
+        # BaseException does not record, leaving repr() and pickling broken
+        super().__init__(operation, details)
         self.operation = operation
         self.details = details
         self.original_error = original_error
-        super().__init__(f"DAO {operation} failed: {details}")
+    
+    def __str__(self) -> str:
+        return f"DAO {self.operation} failed: {self.details}"
 
 class DAOConnectionError(DAOError):
     """Exception for database connection issues"""
@@ -32,112 +43,103 @@ class DAOOperationError(DAOError):
     """Exception for general operation failures"""
     pass
 
-def handle_dao_errors(operation_name: str):
+class ServiceError(Exception):
+    """Service-level failure raised by handle_service_dao_errors; the message is built only when read"""
+    def __init__(self, operation: str, cause: Exception):
+        super().__init__(operation, cause)
+        self.operation = operation
+        self.cause = cause
+    
+    def __str__(self) -> str:
+        if isinstance(self.cause, DAOError):
+            return f"Service '{self.operation}' failed: {self.cause}"
+        return f"Service '{self.operation}' encountered an error: {self.cause}"
+
+# Operations whose False result signals a failed write
+_MUTATION_PREFIXES = ('save_', 'update_', 'delete_', 'create_')
+
+# Error categories checked in order against the lowercased error message;
+# the last field says whether the original message is appended to the details
+_ERROR_RULES = (
+    (("permission", "403"), DAOConnectionError, "Insufficient database permissions", False),
+    (("connection", "timeout"), DAOConnectionError, "Database connection failed", False),
+    (("validation", "invalid"), DAOValidationError, "Data validation failed: ", True),
+)
+
+def _translate_dao_exception(operation_name: str, e: Exception) -> DAOError:
+    """Map a raw database exception to the matching DAOError subclass"""
+    error_message = str(e)
+    lowered = error_message.lower()
+    
+    # Categorize common error types; the first matching rule wins
+    for keywords, error_class, details, quotes_message in _ERROR_RULES:
+        if any(keyword in lowered for keyword in keywords):
+            return error_class(
+                operation=operation_name,
+                details=details + error_message if quotes_message else details,
+                original_error=e
+            )
+    
+    # Generic operation error
+    return DAOOperationError(
+        operation=operation_name,
+        details=error_message,
+        original_error=e
+    )
+
+def handle_dao_errors(operation_name: str, expected_type: Optional[type] = None):
     """
     Decorator to handle common DAO errors and convert them to appropriate exceptions
     
     Args:
-        operation_name: Name of the operation being performed (e.g., "save_assessment", "get_user")
+        operation_name: Name of the operation being performed (e.g., "save_assessment", "get_user");
+            an empty name, or DISABLE_DAO_ERROR_WRAPPING=true in the environment, leaves the function unwrapped
+        expected_type: Type a non-None result must have (optional); a mismatch raises DAOValidationError
     """
+    if not operation_name or _DAO_WRAP_DISABLED:
+        # No translation requested: leave the DAO method as is, with no extra call frame
+        return lambda func: func
+    
+    # The operation kind depends only on its name, so it is settled once here
+    is_get = operation_name.startswith('get_')
+    is_mutation = operation_name.startswith(_MUTATION_PREFIXES)
+    
     def decorator(func: Callable):
         @wraps(func)
         def wrapper(*args, **kwargs):
+            # Only the DAO call itself is guarded; result checks below raise directly
             try:
                 result = func(*args, **kwargs)
-                
-                # Handle None results for operations that should return data
-                if result is None and operation_name.startswith('get_'):
-                    logger.warning(f"DAO operation '{operation_name}' returned None")
-                    return None  # Allow None for get operations
-                
-                # Handle False results for operations that should return boolean success
-                if result is False and any(operation_name.startswith(prefix) for prefix in ['save_', 'update_', 'delete_', 'create_']):
-                    raise DAOOperationError(
-                        operation=operation_name,
-                        details="Operation returned False indicating failure"
-                    )
-                
-                return result
-                
             except DAOError:
                 # Re-raise our custom DAO errors
                 raise
             except Exception as e:
-                error_message = str(e)
-                
-                # Categorize common error types
-                if "permission" in error_message.lower() or "403" in error_message:
-                    raise DAOConnectionError(
-                        operation=operation_name,
-                        details="Insufficient database permissions",
-                        original_error=e
-                    )
-                elif "connection" in error_message.lower() or "timeout" in error_message.lower():
-                    raise DAOConnectionError(
-                        operation=operation_name,
-                        details="Database connection failed",
-                        original_error=e
-                    )
-                elif "validation" in error_message.lower() or "invalid" in error_message.lower():
-                    raise DAOValidationError(
-                        operation=operation_name,
-                        details=f"Data validation failed: {error_message}",
-                        original_error=e
-                    )
-                else:
-                    # Generic operation error
-                    raise DAOOperationError(
-                        operation=operation_name,
-                        details=error_message,
-                        original_error=e
-                    )
+                raise _translate_dao_exception(operation_name, e)
+            
+            # Handle None results for operations that should return data
+            if result is None and is_get:
+                logger.warning(f"DAO operation '{operation_name}' returned None")
+                return None  # Allow None for get operations
+            
+            # Handle False results for operations that should return boolean success
+            if result is False and is_mutation:
+                raise DAOOperationError(
+                    operation=operation_name,
+                    details="Operation returned False indicating failure"
+                )
+            
+            # Enforce the declared result type, when there is one
+            if expected_type is not None and result is not None and not isinstance(result, expected_type):
+                raise DAOValidationError(
+                    operation=operation_name,
+                    details=f"Expected {expected_type.__name__} but got {type(result).__name__}"
+                )
+            
+            return result
         
         return wrapper
     return decorator
 
-def validate_dao_result(result: Any, operation_name: str, expected_type: Optional[type] = None) -> Any:
-    """
-    Validate DAO operation results and raise appropriate exceptions
-    
-    Args:
-        result: The result from the DAO operation
-        operation_name: Name of the operation
-        expected_type: Expected type of the result (optional)
-    
-    Returns:
-        The validated result
-    
-    Raises:
-        DAOOperationError: If the result is invalid
-    """
-    # Check for None results where data is expected
-    if result is None and operation_name.startswith(('get_', 'save_', 'update_')):
-        if operation_name.startswith('get_'):
-            # get_ operations can legitimately return None
-            return None
-        else:
-            # save_ and update_ operations should not return None
-            raise DAOOperationError(
-                operation=operation_name,
-                details="Operation returned None instead of expected result"
-            )
-    
-    # Check for False results in boolean operations
-    if result is False and any(operation_name.startswith(prefix) for prefix in ['save_', 'update_', 'delete_', 'create_']):
-        raise DAOOperationError(
-            operation=operation_name,
-            details="Operation returned False indicating failure"
-        )
-    
-    # Type checking if expected_type is provided
-    if expected_type is not None and result is not None and not isinstance(result, expected_type):
-        raise DAOValidationError(
-            operation=operation_name,
-            details=f"Expected {expected_type.__name__} but got {type(result).__name__}"
-        )
-    
-    return result
-
 # Utility functions for common patterns
 def ensure_document_id(document_id: Optional[str], operation_name: str) -> str:
     """Ensure a document ID is valid and not None"""
@@ -170,33 +172,26 @@ def handle_service_dao_errors(service_operation: str):
     Converts DAO errors to service-level exceptions with better context
     """
     def decorator(func: Callable):
-        @wraps(func)
-        async def async_wrapper(*args, **kwargs):
-            try:
-                return await func(*args, **kwargs)
-            except DAOError as dao_error:
-                # Convert DAO error to service error with additional context
-                raise Exception(f"Service '{service_operation}' failed: {str(dao_error)}")
-            except Exception as e:
-                # Handle any other errors
-                raise Exception(f"Service '{service_operation}' encountered an error: {str(e)}")
+        # Only the wrapper matching the function's kind is built
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    # DAO and other errors alike, with the original kept as the cause
+                    raise ServiceError(service_operation, e) from e
+            
+            return async_wrapper
         
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
             try:
                 return func(*args, **kwargs)
-            except DAOError as dao_error:
-                # Convert DAO error to service error with additional context  
-                raise Exception(f"Service '{service_operation}' failed: {str(dao_error)}")
             except Exception as e:
-                # Handle any other errors
-                raise Exception(f"Service '{service_operation}' encountered an error: {str(e)}")
+                # DAO and other errors alike, with the original kept as the cause
+                raise ServiceError(service_operation, e) from e
         
-        # Return appropriate wrapper based on whether function is async
-        import asyncio
-        if asyncio.iscoroutinefunction(func):
-            return async_wrapper
-        else:
-            return sync_wrapper
+        return sync_wrapper
     
     return decorator
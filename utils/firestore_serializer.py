@@ -6,40 +6,89 @@ import json
 from datetime import datetime
 from typing import Any, Dict, List, Union
 
+# Leaf types that never need conversion; most Firestore fields are one of these
+_PLAIN_LEAF_TYPES = frozenset((str, int, float, bool, type(None), bytes))
+
 def convert_firestore_datetime(obj: Any) -> Any:
     """
     Convert DatetimeWithNanoseconds to ISO format string
     
+    Walks nested dicts and lists with an explicit stack rather than recursion,
+    so deeply nested documents cannot hit the recursion limit. The input is
+    left untouched; containers are copied.
+    
     Args:
         obj: Object to convert
         
     Returns:
         Converted object with datetime strings
     """
-    # Check if object is a Firestore DatetimeWithNanoseconds
-    if hasattr(obj, '__class__') and obj.__class__.__name__ == 'DatetimeWithNanoseconds':
-        return obj.isoformat()
-    elif isinstance(obj, datetime):
+    # Firestore's DatetimeWithNanoseconds subclasses datetime, so one C-level check covers both
+    if isinstance(obj, datetime):
         return obj.isoformat()
-    elif isinstance(obj, dict):
-        return {key: convert_firestore_datetime(value) for key, value in obj.items()}
+    # Containers are copied wholesale in C; only entries needing conversion are then rewritten
+    if isinstance(obj, dict):
+        converted = dict(obj)
     elif isinstance(obj, list):
-        return [convert_firestore_datetime(item) for item in obj]
+        converted = list(obj)
     else:
         return obj
+    
+    stack = [converted]
+    while stack:
+        container = stack.pop()
+        for key, value in (container.items() if isinstance(container, dict) else enumerate(container)):
+            # One set lookup settles plain leaves, which the copy already holds
+            if type(value) in _PLAIN_LEAF_TYPES:
+                continue
+            if isinstance(value, datetime):
+                container[key] = value.isoformat()
+            elif isinstance(value, dict):
+                container[key] = child = dict(value)
+                stack.append(child)
+            elif isinstance(value, list):
+                container[key] = child = list(value)
+                stack.append(child)
+    
+    return converted
+
+def _contains_datetime(obj: Any) -> bool:
+    """Read-only scan that stops at the first datetime found"""
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if type(value) in _PLAIN_LEAF_TYPES:
+            continue
+        if isinstance(value, datetime):
+            return True
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return False
 
 def firestore_to_json(data: Union[Dict, List]) -> Union[Dict, List]:
     """
     Convert Firestore document data to JSON-serializable format
     
+    Data without any datetime values is returned as is rather than copied.
+    
     Args:
         data: Firestore document data
         
     Returns:
         JSON-serializable data
     """
+    if not _contains_datetime(data):
+        return data
     return convert_firestore_datetime(data)
 
+def _firestore_default(obj: Any) -> Any:
+    """json.dumps hook for values the encoder cannot serialize natively"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
 def safe_json_dumps(data: Any, **kwargs) -> str:
     """
     Safely serialize data to JSON, converting Firestore types
@@ -51,5 +100,6 @@ def safe_json_dumps(data: Any, **kwargs) -> str:
     Returns:
         JSON string
     """
-    converted_data = convert_firestore_datetime(data)
-    return json.dumps(converted_data, **kwargs)
+    # The encoder calls the default hook only for values it cannot serialize,
+    # so no converted copy of the document is built
+    return json.dumps(data, default=_firestore_default, **kwargs)